@@ -0,0 +1 @@
+"""Tooling for running and timing the daily solutions under ``days/``"""
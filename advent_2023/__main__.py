@@ -0,0 +1,5 @@
+import sys
+
+from advent_2023.cli import main
+
+sys.exit(main())
@@ -0,0 +1,176 @@
+"""Solve many puzzles at once on a process pool
+
+Jobs are submitted longest first, going by the last bench baseline or the
+answer cache's timings on each day's input.txt, so the slow days aren't
+left to start at the end while the other workers sit idle. Puzzles with
+no timing on record go first, they might be slow."""
+
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+from advent_2023 import bench
+from advent_2023.cache import AnswerCache, CachedAnswer, file_sha256
+from advent_2023.puzzles import Puzzle
+from advent_2023.runner import RunResult, run_puzzle
+from advent_2023.timing import format_seconds
+
+
+def expected_seconds(
+    puzzles: list[Puzzle],
+    answers: AnswerCache,
+    baseline_path: Path = bench.BASELINE_PATH,
+) -> dict[Puzzle, float]:
+    """How long each puzzle took on its input.txt last time it was timed,
+    ``inf`` if never"""
+
+    # bench leaves cache entries for its bigger inputs too, those don't count
+    real_inputs = {
+        (p.day, p.part): file_sha256(p.input_path)
+        for p in puzzles
+        if p.input_path.exists()
+    }
+    # oldest first, so the latest entry for a day and part wins
+    recorded = {
+        (entry.day, entry.part): entry.seconds
+        for entry in answers.stored()
+        if real_inputs.get((entry.day, entry.part)) == entry.input_sha256
+    }
+    if Path(baseline_path).exists():
+        for result in bench.load_results(baseline_path).values():
+            if result.input == "input":
+                recorded[result.day, result.part] = result.median
+
+    return {p: recorded.get((p.day, p.part), math.inf) for p in puzzles}
+
+
+def longest_first(
+    puzzles: list[Puzzle],
+    answers: AnswerCache,
+    baseline_path: Path = bench.BASELINE_PATH,
+) -> list[Puzzle]:
+    """The order run_all() submits jobs in, ties broken by day and part"""
+
+    expected = expected_seconds(puzzles, answers, baseline_path)
+    return sorted(puzzles, key=lambda p: (-expected[p], p.day, p.part))
+
+
+def solve_job(puzzle: Puzzle, input_path: Path, stream: bool) -> RunResult:
+    """What a worker runs, a plain function so the pool can pickle it"""
+
+    return run_puzzle(puzzle, input_path, stream=stream)
+
+
+@dataclass
+class BatchResult:
+    puzzle: Puzzle
+    answer: object = None
+    seconds: float = 0.0
+    cached: bool = False
+    error: str | None = None
+
+    def row(self) -> str:
+        if self.error is not None:
+            status, answer = "FAILED", self.error
+        else:
+            status, answer = ("cached" if self.cached else "solved"), self.answer
+        return f"{self.puzzle!s:18} {status:>7} {format_seconds(self.seconds):>12}  {answer}"
+
+
+HEADER = f"{'puzzle':18} {'':>7} {'solve':>12}  answer"
+
+
+def run_all(
+    puzzles: list[Puzzle],
+    workers: int | None = None,
+    stream: bool = False,
+    use_cache: bool = True,
+) -> list[BatchResult]:
+    """Solve every puzzle that has an input, in day order in the result"""
+
+    answers = AnswerCache()
+    results = {}
+    jobs = {}
+    for puzzle in puzzles:
+        if not puzzle.input_path.exists():
+            continue
+        input_sha256 = file_sha256(puzzle.input_path)
+        key = answers.key(puzzle, input_sha256)
+        if use_cache and (cached := answers.get(key)) is not None:
+            results[puzzle] = BatchResult(puzzle, cached.answer, cached.seconds, True)
+        else:
+            jobs[puzzle] = (key, input_sha256)
+
+    with ProcessPoolExecutor(workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(solve_job, puzzle, puzzle.input_path, stream): puzzle
+            for puzzle in longest_first(list(jobs), answers)
+        }
+        for future in as_completed(futures):
+            puzzle = futures[future]
+            try:
+                run = future.result()
+            except Exception as exc:
+                results[puzzle] = BatchResult(
+                    puzzle, error=f"{type(exc).__name__}: {exc}"
+                )
+                continue
+            key, input_sha256 = jobs[puzzle]
+            answers.put(key, CachedAnswer.from_run(run, input_sha256))
+            results[puzzle] = BatchResult(puzzle, run.answer, run.stats("wall").min)
+
+    return [results[p] for p in sorted(results, key=lambda p: (p.day, p.part))]
+
+
+def summary(results: list[BatchResult], wall: float, workers: int) -> str:
+    solved = [r for r in results if not r.cached and r.error is None]
+    cached = sum(r.cached for r in results)
+    failed = sum(r.error is not None for r in results)
+    busy = sum(r.seconds for r in solved)
+    return (
+        f"{len(solved)} solved, {cached} cached, {failed} failed in"
+        f" {format_seconds(wall)} ({format_seconds(busy)} of solving"
+        f" on {workers} workers)"
+    )
+
+
+# Only defined under pytest, so a plain import skips pytest
+if "pytest" in sys.modules:
+
+    def test_longest_first(tmp_path) -> None:
+        puzzles = []
+        for day in 1, 2, 3:
+            path = tmp_path / f"{day:02d}" / "part1.py"
+            path.parent.mkdir()
+            path.write_text("")
+            (path.parent / "input.txt").write_text(f"day {day}")
+            puzzles.append(Puzzle(day, "1", path))
+        bench_input = tmp_path / "x100.txt"
+        bench_input.write_text("a much bigger input")
+
+        answers = AnswerCache(tmp_path / "cache")
+        timings = [
+            (puzzles[0], puzzles[0].input_path, 1.0),
+            (puzzles[1], puzzles[1].input_path, 2.0),
+            # day 1 on a bench input, later than its real timing
+            (puzzles[0], bench_input, 50.0),
+        ]
+        for mtime, (puzzle, input_path, seconds) in enumerate(timings):
+            input_sha256 = file_sha256(input_path)
+            key = answers.key(puzzle, input_sha256)
+            answers.put(
+                key, CachedAnswer(puzzle.day, "1", input_sha256, "", 0, seconds)
+            )
+            os.utime(answers.path(key), (mtime, mtime))
+
+        baseline = tmp_path / "baseline.json"
+        assert expected_seconds(puzzles, answers, baseline) == {
+            puzzles[0]: 1.0,
+            puzzles[1]: 2.0,
+            puzzles[2]: math.inf,
+        }
+        # never timed first, then slowest first
+        assert longest_first(puzzles, answers, baseline) == puzzles[::-1]
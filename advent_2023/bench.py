@@ -0,0 +1,152 @@
+"""Benchmark every solve() against its registered inputs, store the results
+as JSON and compare a run against a stored baseline"""
+
+import hashlib
+import json
+import platform
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from advent_2023.cache import AnswerCache, CachedAnswer, file_sha256
+from advent_2023.lazy import finish_lazy_imports
+from advent_2023.memory import traced_peak
+from advent_2023.puzzles import DAYS_DIR, Puzzle, load
+from advent_2023.runner import RunResult, time_solve
+from advent_2023.timing import format_seconds
+
+BENCH_DIR = DAYS_DIR.parent / "benchmarks"
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+RESULTS_PATH = BENCH_DIR / "latest.json"
+
+
+def registered_inputs(puzzle: Puzzle) -> dict[str, Path]:
+    """The day's input.txt plus any bigger inputs under ``days/NN/bench/``,
+    named by size, e.g. ``days/12/bench/x100.txt`` is registered as "x100"."""
+
+    inputs = {}
+    if puzzle.input_path.exists():
+        inputs["input"] = puzzle.input_path
+    for path in sorted((puzzle.path.parent / "bench").glob("*.txt")):
+        inputs[path.stem] = path
+    return inputs
+
+
+def answer_hash(answer) -> str:
+    return hashlib.sha256(str(answer).encode()).hexdigest()[:16]
+
+
+@dataclass
+class BenchResult:
+    day: int
+    part: str
+    input: str
+    input_bytes: int
+    min: float
+    median: float
+    peak_bytes: int
+    answer_sha256: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.day:02d}/{self.part}/{self.input}"
+
+    def row(self) -> str:
+        return (
+            f"{self.key:20} {self.input_bytes:>12,} {format_seconds(self.min):>12}"
+            f" {format_seconds(self.median):>12} {self.peak_bytes / 2**20:>10.1f} MB"
+        )
+
+
+HEADER = (
+    f"{'benchmark':20} {'input bytes':>12} {'min':>12} {'median':>12} {'peak mem':>13}"
+)
+
+
+def bench_puzzle(
+    puzzle: Puzzle, repeat: int = 5, answers: AnswerCache | None = None
+) -> list[BenchResult]:
+    """Time every registered input, and store what was measured in
+    ``answers`` for the runner to reuse"""
+
+    module = load(puzzle)
+    finish_lazy_imports(module)
+    results = []
+    for label, path in registered_inputs(puzzle).items():
+        run = time_solve(module, path, repeat, RunResult(puzzle))
+        wall = run.stats("wall")
+
+        # separate call for memory, tracemalloc slows everything down
+        input_data = path.read_text().strip()
+        _, peak = traced_peak(module.solve, input_data, *puzzle.solve_args)
+
+        if answers is not None:
+            input_sha256 = file_sha256(path)
+            answers.put(
+                answers.key(puzzle, input_sha256),
+                CachedAnswer.from_run(run, input_sha256, peak),
+            )
+
+        results.append(
+            BenchResult(
+                puzzle.day,
+                puzzle.part,
+                label,
+                path.stat().st_size,
+                wall.min,
+                wall.median,
+                peak,
+                answer_hash(run.answer),
+            )
+        )
+    return results
+
+
+def save_results(results: list[BenchResult], path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "results": {r.key: asdict(r) for r in results},
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def load_results(path: Path) -> dict[str, BenchResult]:
+    document = json.loads(Path(path).read_text())
+    return {key: BenchResult(**value) for key, value in document["results"].items()}
+
+
+def compare(
+    baseline: dict[str, BenchResult],
+    current: dict[str, BenchResult],
+    threshold: float,
+    min_time: float = 1e-3,
+) -> list[str]:
+    """Return a line for everything that got more than ``threshold`` percent
+    slower than the baseline, whose answer changed, or that has no result in
+    ``current`` at all
+
+    Anything under ``min_time`` in both runs is left alone, at microsecond
+    scale the noise is bigger than any threshold worth setting."""
+
+    problems = [f"{key}: no result" for key in sorted(baseline.keys() - current.keys())]
+    for key, now in sorted(current.items()):
+        before = baseline.get(key)
+        if before is None:
+            continue
+        if now.answer_sha256 != before.answer_sha256:
+            problems.append(f"{key}: answer changed")
+        if max(now.median, before.median) < min_time:
+            continue
+        if before.median <= 0:
+            problems.append(f"{key}: baseline median is {before.median}, can't compare")
+            continue
+        slowdown = 100 * (now.median / before.median - 1)
+        if slowdown > threshold:
+            problems.append(
+                f"{key}: {slowdown:.0f}% slower"
+                f" ({format_seconds(before.median)} -> {format_seconds(now.median)})"
+            )
+    return problems
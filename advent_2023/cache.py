@@ -0,0 +1,164 @@
+"""Answers remembered on disk, so a rerun only recomputes what changed
+
+An entry is keyed by the day, part, solve() arguments, the sha256 of the
+input file, the sha256 of the solution module's source and a hash of the
+``advent_2023`` package's sources, so editing a day's partP.py or its input
+misses that day's entries, and editing a shared module such as grid.py or
+parsing.py misses everything.
+
+Each entry is a small JSON file. A hit touches its mtime, and ``evict()``
+deletes the least recently used entries once they add up to more than
+``max_bytes``."""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from functools import cache
+from pathlib import Path
+
+from advent_2023.puzzles import DAYS_DIR, Puzzle
+from advent_2023.runner import RunResult
+from advent_2023.timing import format_seconds
+
+CACHE_DIR = DAYS_DIR.parent / ".answer-cache"
+PACKAGE_DIR = Path(__file__).parent
+MAX_BYTES = 4 * 2**20
+
+
+def file_sha256(path: Path) -> str:
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+@cache
+def package_sha256() -> str:
+    """One sha256 over every advent_2023/*.py, worked out once per process"""
+
+    digest = hashlib.sha256()
+    for path in sorted(PACKAGE_DIR.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedAnswer:
+    day: int
+    part: str
+    input_sha256: str
+    source_sha256: str
+    answer: object
+    seconds: float
+    peak_bytes: int | None = None
+
+    @classmethod
+    def from_run(
+        cls, result: RunResult, input_sha256: str, peak_bytes: int | None = None
+    ) -> "CachedAnswer":
+        puzzle = result.puzzle
+        answer = result.answer
+        # JSON keeps ints, floats and strings as they are, the rest as text
+        if not isinstance(answer, int | float | str) or isinstance(answer, bool):
+            answer = str(answer)
+        return cls(
+            puzzle.day,
+            puzzle.part,
+            input_sha256,
+            file_sha256(puzzle.path),
+            answer,
+            result.stats("wall").median,
+            peak_bytes,
+        )
+
+    def report(self) -> str:
+        return (
+            f"day {self.day:02d} part {self.part}: {self.answer}"
+            f"  (cached, solved in {format_seconds(self.seconds)})"
+        )
+
+
+class AnswerCache:
+    def __init__(self, directory: Path = CACHE_DIR, max_bytes: int = MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def key(self, puzzle: Puzzle, input_sha256: str) -> str:
+        """``input_sha256`` is file_sha256() of the input, worked out once by
+        the caller since it's also stored in the entry"""
+
+        parts = (
+            puzzle.day,
+            puzzle.part,
+            repr(puzzle.solve_args),
+            input_sha256,
+            file_sha256(puzzle.path),
+            package_sha256(),
+        )
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _read(self, path: Path) -> CachedAnswer | None:
+        try:
+            return CachedAnswer(**json.loads(path.read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def get(self, key: str) -> CachedAnswer | None:
+        entry = self._read(self.path(key))
+        if entry is not None:
+            # mark as recently used for evict()
+            self.path(key).touch()
+        return entry
+
+    def stored(self) -> list[CachedAnswer]:
+        """Every entry, least recently used first, without marking any used"""
+
+        found = (self._read(path) for _, _, path in self.entries())
+        return [entry for entry in found if entry is not None]
+
+    def put(self, key: str, entry: CachedAnswer):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # written aside and renamed, so a reader never sees half an entry
+        partial = self.path(key).with_suffix(f".{os.getpid()}.tmp")
+        partial.write_text(json.dumps(asdict(entry), indent=2) + "\n")
+        partial.replace(self.path(key))
+        self.evict()
+
+    def entries(self) -> list[tuple[float, int, Path]]:
+        """(last used, bytes, path) for every entry, least recently used first"""
+
+        found = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            found.append((stat.st_mtime, stat.st_size, path))
+        return sorted(found)
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the rest fit in
+        max_bytes, returns how many went"""
+
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        return evicted
+
+    def clear(self) -> int:
+        entries = self.entries()
+        for _, _, path in entries:
+            path.unlink(missing_ok=True)
+        return len(entries)
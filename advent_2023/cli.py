@@ -0,0 +1,395 @@
+import argparse
+import os
+from pathlib import Path
+from time import perf_counter
+
+from advent_2023 import (
+    batch,
+    bench,
+    generators,
+    importtime,
+    memory,
+    profiling,
+    trace,
+)
+from advent_2023.cache import CACHE_DIR, AnswerCache, CachedAnswer, file_sha256
+from advent_2023.puzzles import DAYS_DIR, Puzzle, discover, select
+from advent_2023.runner import run_puzzle
+
+
+def add_selection_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--day", type=int, help="day number, default is every day")
+    parser.add_argument("--part", help="1, 2 or a variant like 2_v2")
+    parser.add_argument(
+        "--days-dir", type=Path, default=DAYS_DIR, help="where the days/NN dirs live"
+    )
+
+
+def selected_puzzles(args) -> list[Puzzle]:
+    if getattr(args, "path", None) is not None:
+        return [Puzzle.from_path(args.path)]
+    return select(args.day, args.part, args.days_dir)
+
+
+def cmd_list(args) -> int:
+    for puzzle in discover(args.days_dir):
+        has_input = "input" if puzzle.input_path.exists() else "no input"
+        print(f"{puzzle}  {puzzle.path.relative_to(args.days_dir)}  ({has_input})")
+    return 0
+
+
+def run_selection(args) -> list[Puzzle]:
+    puzzles = selected_puzzles(args)
+    if args.input is not None and len(puzzles) > 1:
+        raise SystemExit("--input needs a single --day and --part")
+    if (args.target or args.lines) and not args.profile:
+        raise SystemExit("--target and --lines go with --profile")
+    return puzzles
+
+
+def cmd_run(args) -> int:
+    puzzles = run_selection(args)
+    if args.profile:
+        return run_profiles(puzzles, args)
+
+    tracing = args.trace_every is not None
+    if tracing:
+        trace.ic.enable(every=args.trace_every)
+
+    # asking for a trace or for repeats means actually running it
+    answers = AnswerCache()
+    use_cache = not (args.no_cache or tracing or args.repeat > 1)
+
+    failed = 0
+    for puzzle in puzzles:
+        input_path = args.input or puzzle.input_path
+        if not input_path.exists():
+            print(f"{puzzle}: skipped, no {input_path.name}")
+            continue
+
+        input_sha256 = file_sha256(input_path)
+        key = answers.key(puzzle, input_sha256)
+        if use_cache and (cached := answers.get(key)) is not None:
+            print(cached.report())
+            continue
+
+        try:
+            result = run_puzzle(puzzle, input_path, args.repeat, tracing, args.stream)
+        except Exception as exc:
+            if len(puzzles) == 1:
+                raise
+            print(f"{puzzle}: FAILED ({type(exc).__name__}: {exc})")
+            failed += 1
+            continue
+        print(result.report())
+        if not tracing:
+            answers.put(key, CachedAnswer.from_run(result, input_sha256))
+    return 1 if failed else 0
+
+
+def cmd_run_all(args) -> int:
+    puzzles = selected_puzzles(args)
+    workers = args.workers or os.cpu_count()
+
+    start = perf_counter()
+    results = batch.run_all(puzzles, workers, args.stream, not args.no_cache)
+    wall = perf_counter() - start
+
+    print(batch.HEADER)
+    for result in results:
+        print(result.row())
+    print(batch.summary(results, wall, workers))
+    return 1 if any(result.error is not None for result in results) else 0
+
+
+def run_profiles(puzzles: list[Puzzle], args) -> int:
+    failed = 0
+    for puzzle in puzzles:
+        input_path = args.input or puzzle.input_path
+        if not input_path.exists():
+            print(f"{puzzle}: skipped, no {input_path.name}")
+            continue
+        try:
+            profile = profiling.profile_puzzle(
+                puzzle, input_path, tuple(args.target), args.lines, args.stream
+            )
+        except Exception as exc:
+            if len(puzzles) == 1:
+                raise
+            print(f"{puzzle}: FAILED ({type(exc).__name__}: {exc})")
+            failed += 1
+            continue
+        out = profiling.write_profile(profile, args.profile_dir, args.top)
+        print(f"{puzzle}: {profile.answer}  (profile in {out})")
+        print(profiling.top_functions(profile.stats, args.top))
+    return 1 if failed else 0
+
+
+def run_benchmarks(
+    puzzles: list[Puzzle], repeat: int
+) -> tuple[list[bench.BenchResult], bool]:
+    """The results of every puzzle that ran, and whether any of them failed"""
+
+    print(bench.HEADER)
+    results = []
+    failed = False
+    answers = AnswerCache()
+    for puzzle in puzzles:
+        try:
+            puzzle_results = bench.bench_puzzle(puzzle, repeat, answers)
+        except Exception as exc:
+            print(f"{puzzle}: FAILED ({type(exc).__name__}: {exc})")
+            failed = True
+            continue
+        for result in puzzle_results:
+            print(result.row())
+        results.extend(puzzle_results)
+    return results, failed
+
+
+def cmd_bench(args) -> int:
+    results, failed = run_benchmarks(selected_puzzles(args), args.repeat)
+    bench.save_results(results, args.output)
+    if failed:
+        if args.save_baseline:
+            print("baseline not saved, some benchmarks failed")
+        return 1
+    if args.save_baseline:
+        bench.save_results(results, args.baseline)
+        print(f"baseline saved to {args.baseline}")
+    return 0
+
+
+def cmd_compare(args) -> int:
+    puzzles = selected_puzzles(args)
+    # only hold the puzzles asked for to the baseline, --day 5 isn't missing day 6
+    selected = {(puzzle.day, puzzle.part) for puzzle in puzzles}
+    baseline = {
+        key: result
+        for key, result in bench.load_results(args.baseline).items()
+        if (result.day, result.part) in selected
+    }
+    failed = False
+    if args.results is not None:
+        current = bench.load_results(args.results)
+    else:
+        results, failed = run_benchmarks(puzzles, args.repeat)
+        current = {r.key: r for r in results}
+
+    problems = bench.compare(baseline, current, args.threshold, args.min_time)
+    for problem in problems:
+        print(problem)
+    if problems or failed:
+        return 1
+    print(f"no regressions over {args.threshold}% in {len(current)} benchmarks")
+    return 0
+
+
+def cmd_importtime(args) -> int:
+    failed = 0
+    for puzzle in selected_puzzles(args):
+        try:
+            print(importtime.measure(puzzle).report(args.top))
+        except RuntimeError as exc:
+            print(f"{puzzle}: FAILED ({exc})")
+            failed += 1
+    return 1 if failed else 0
+
+
+def cmd_memory(args) -> int:
+    puzzles = selected_puzzles(args)
+    if args.input is not None and len(puzzles) > 1:
+        raise SystemExit("--input needs a single --day and --part")
+
+    failed = 0
+    for puzzle in puzzles:
+        input_path = args.input or puzzle.input_path
+        if not input_path.exists():
+            print(f"{puzzle}: skipped, no {input_path.name}")
+            continue
+        try:
+            print(memory.measure(puzzle, input_path, args.top).report())
+        except RuntimeError as exc:
+            print(f"{puzzle}: FAILED ({exc})")
+            failed += 1
+    return 1 if failed else 0
+
+
+def cmd_cache(args) -> int:
+    answers = AnswerCache(args.cache_dir)
+    if args.clear:
+        print(f"removed {answers.clear()} cached answers")
+        return 0
+    entries = answers.entries()
+    size = sum(size for _, size, _ in entries)
+    print(f"{len(entries)} cached answers, {size:,} bytes in {answers.directory}")
+    return 0
+
+
+def cmd_generate(args) -> int:
+    days = [args.day] if args.day is not None else sorted(generators.GENERATORS)
+    if args.output is not None and len(days) > 1:
+        raise SystemExit("--output needs a single --day")
+
+    for day in days:
+        path = (
+            args.output
+            or args.days_dir / f"{day:02d}" / "bench" / f"x{args.size:g}.txt"
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(generators.generate(day, args.size, args.seed) + "\n")
+        print(f"day {day:02d}: {path} ({path.stat().st_size:,} bytes)")
+    return 0
+
+
+def add_run_command(commands):
+    run_parser = commands.add_parser("run", help="time solve() on the puzzle input")
+    add_selection_args(run_parser)
+    run_parser.add_argument("--path", type=Path, help="a single partP.py to run")
+    run_parser.add_argument("--input", type=Path, help="default is the day's input.txt")
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.add_argument(
+        "--trace",
+        dest="trace_every",
+        nargs="?",
+        type=int,
+        const=1,
+        metavar="N",
+        help="keep the ic() debug trace, printing every Nth call from each line",
+    )
+    run_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="read the input as solve() goes, for days that can (see STREAMS)",
+    )
+    run_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="solve again even if the answer for this code and input is cached",
+    )
+    run_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="profile one solve() instead of timing it, see profiling.py",
+    )
+    run_parser.add_argument("--profile-dir", type=Path, default=profiling.PROFILE_DIR)
+    run_parser.add_argument(
+        "--target",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="only profile inside this function, e.g. ScoreKeeper.solve",
+    )
+    run_parser.add_argument(
+        "--top", type=int, default=15, help="how many functions to list"
+    )
+    run_parser.add_argument(
+        "--lines", action="store_true", help="also time each line of the targets"
+    )
+    run_parser.set_defaults(func=cmd_run)
+
+
+def add_run_all_command(commands):
+    run_all_parser = commands.add_parser(
+        "run-all", help="solve everything on a process pool, longest first"
+    )
+    add_selection_args(run_all_parser)
+    run_all_parser.add_argument("--workers", type=int, help="default is one per CPU")
+    run_all_parser.add_argument(
+        "--stream", action="store_true", help="as for run, see STREAMS"
+    )
+    run_all_parser.add_argument(
+        "--no-cache", action="store_true", help="solve even if the answer is cached"
+    )
+    run_all_parser.set_defaults(func=cmd_run_all)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="advent_2023", description="Run and time the Advent of Code solutions"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="show every solution module")
+    list_parser.add_argument("--days-dir", type=Path, default=DAYS_DIR)
+    list_parser.set_defaults(func=cmd_list)
+
+    add_run_command(commands)
+    add_run_all_command(commands)
+
+    bench_parser = commands.add_parser(
+        "bench", help="time and memory for every solve() on every registered input"
+    )
+    add_selection_args(bench_parser)
+    bench_parser.add_argument("--repeat", type=int, default=5)
+    bench_parser.add_argument("--output", type=Path, default=bench.RESULTS_PATH)
+    bench_parser.add_argument("--baseline", type=Path, default=bench.BASELINE_PATH)
+    bench_parser.add_argument(
+        "--save-baseline", action="store_true", help="also store as the baseline"
+    )
+    bench_parser.set_defaults(func=cmd_bench)
+
+    compare_parser = commands.add_parser(
+        "compare", help="fail if anything got slower than the baseline"
+    )
+    add_selection_args(compare_parser)
+    compare_parser.add_argument("--baseline", type=Path, default=bench.BASELINE_PATH)
+    compare_parser.add_argument(
+        "--results", type=Path, help="saved bench results, default is to run now"
+    )
+    compare_parser.add_argument("--repeat", type=int, default=5)
+    compare_parser.add_argument(
+        "--threshold", type=float, default=20, help="percent slower that fails"
+    )
+    compare_parser.add_argument(
+        "--min-time", type=float, default=1e-3, help="seconds, ignore anything faster"
+    )
+    compare_parser.set_defaults(func=cmd_compare)
+
+    importtime_parser = commands.add_parser(
+        "importtime", help="import each solution in a fresh interpreter and time it"
+    )
+    add_selection_args(importtime_parser)
+    importtime_parser.add_argument(
+        "--top", type=int, default=5, help="how many of the slowest imports to name"
+    )
+    importtime_parser.set_defaults(func=cmd_importtime)
+
+    memory_parser = commands.add_parser(
+        "memory", help="peak RSS, tracemalloc peak and top allocating lines of solve()"
+    )
+    add_selection_args(memory_parser)
+    memory_parser.add_argument("--path", type=Path, help="a single partP.py")
+    memory_parser.add_argument("--input", type=Path, help="default is input.txt")
+    memory_parser.add_argument(
+        "--top", type=int, default=5, help="how many call sites to list"
+    )
+    memory_parser.set_defaults(func=cmd_memory)
+
+    cache_parser = commands.add_parser(
+        "cache", help="show or clear the answers run remembers between runs"
+    )
+    cache_parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    cache_parser.add_argument("--clear", action="store_true")
+    cache_parser.set_defaults(func=cmd_cache)
+
+    generate_parser = commands.add_parser(
+        "generate", help="write synthetic inputs where bench picks them up"
+    )
+    generate_parser.add_argument("--day", type=int, help="default is every day")
+    generate_parser.add_argument(
+        "--size", type=float, default=1, help="multiple of a real input's size"
+    )
+    generate_parser.add_argument("--seed", type=int, default=2023)
+    generate_parser.add_argument(
+        "--output", type=Path, help="default is days/NN/bench/x<size>.txt"
+    )
+    generate_parser.add_argument("--days-dir", type=Path, default=DAYS_DIR)
+    generate_parser.set_defaults(func=cmd_generate)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,792 @@
+"""Synthetic puzzle inputs at any scale
+
+``generate(day, size, seed)`` returns text in the same format as that day's
+input.txt. ``size=1`` is roughly the size of a real puzzle input and the
+amount of input grows linearly with it, so grids get sqrt(size) wider and
+taller while line-per-item puzzles get size times as many lines. The same
+seed always gives the same text.
+
+Several solutions lean on properties the real inputs happen to have (unique
+hands on day 7, a single counter per rx feeder on day 20, ...), each
+generator below notes the ones it keeps."""
+
+import math
+import random
+from collections import defaultdict
+from itertools import pairwise
+from string import ascii_lowercase, ascii_uppercase
+
+DIGIT_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+
+def scaled(n: int, size: float) -> int:
+    return max(1, round(n * size))
+
+
+def side(n: int, size: float, minimum: int = 5) -> int:
+    return max(minimum, round(n * math.sqrt(size)))
+
+
+def names(rng: random.Random, count: int, letters: str, width: int = 3) -> list[str]:
+    """``count`` distinct random names, wider than ``width`` if they won't fit"""
+
+    while len(letters) ** width < 2 * count:
+        width += 1
+    found = set()
+    while len(found) < count:
+        found.add("".join(rng.choices(letters, k=width)))
+    return sorted(found)
+
+
+def is_prime(n: int) -> bool:
+    return n > 1 and all(n % i for i in range(2, math.isqrt(n) + 1))
+
+
+def spanning_tree(rows: int, cols: int, rng: random.Random) -> list:
+    """Edges of a random spanning tree of a rows x cols lattice (randomized DFS)"""
+
+    start = (rng.randrange(rows), rng.randrange(cols))
+    seen = {start}
+    stack = [start]
+    edges = []
+    while stack:
+        r, c = stack[-1]
+        options = [
+            (r + dr, c + dc)
+            for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1))
+            if 0 <= r + dr < rows
+            and 0 <= c + dc < cols
+            and (r + dr, c + dc) not in seen
+        ]
+        if not options:
+            stack.pop()
+            continue
+        nxt = rng.choice(options)
+        seen.add(nxt)
+        edges.append(((r, c), nxt))
+        stack.append(nxt)
+    return edges
+
+
+def tree_loop(rows: int, cols: int, rng: random.Random, block: int) -> list:
+    """A simple closed loop of grid points, in walking order
+
+    The loop is the outline of a random spanning tree on a rows x cols
+    lattice, drawn with corridors ``block`` cells wide. A tree has no holes
+    and the corridors never touch only at a corner, so every point on the
+    outline has exactly two neighbors along it and the loop never crosses
+    itself. The points fit in a ((block + 1) * rows) square-ish grid."""
+
+    step = block + 1
+    cells = set()
+    for r in range(rows):
+        for c in range(cols):
+            cells.update(
+                (step * r + i, step * c + j) for i in range(block) for j in range(block)
+            )
+    for (r1, c1), (r2, c2) in spanning_tree(rows, cols, rng):
+        r, c = min(r1, r2), min(c1, c2)
+        if r1 != r2:
+            cells.update((step * r + block, step * c + j) for j in range(block))
+        else:
+            cells.update((step * r + i, step * c + block) for i in range(block))
+
+    # outline segments between cell corners, corner (r, c) is top-left of cell (r, c)
+    outline = defaultdict(list)
+    for r, c in cells:
+        for neighbor, corner1, corner2 in (
+            ((r - 1, c), (r, c), (r, c + 1)),
+            ((r + 1, c), (r + 1, c), (r + 1, c + 1)),
+            ((r, c - 1), (r, c), (r + 1, c)),
+            ((r, c + 1), (r, c + 1), (r + 1, c + 1)),
+        ):
+            if neighbor not in cells:
+                outline[corner1].append(corner2)
+                outline[corner2].append(corner1)
+    assert all(len(v) == 2 for v in outline.values()), "outline touches itself"
+
+    first = min(outline)
+    loop = [first, outline[first][0]]
+    while True:
+        prev, here = loop[-2], loop[-1]
+        a, b = outline[here]
+        nxt = b if a == prev else a
+        if nxt == first:
+            break
+        loop.append(nxt)
+    assert len(loop) == len(outline)
+    return loop
+
+
+# --> one generator per day
+
+
+def day01(size, rng):
+    """Calibration lines, each with at least one real digit for part 1"""
+
+    lines = []
+    for _ in range(scaled(1000, size)):
+        pieces = []
+        for _ in range(rng.randint(2, 7)):
+            match rng.randrange(3):
+                case 0:
+                    pieces.append(
+                        "".join(rng.choices(ascii_lowercase, k=rng.randint(1, 5)))
+                    )
+                case 1:
+                    pieces.append(rng.choice(DIGIT_WORDS))
+                case 2:
+                    pieces.append(str(rng.randint(1, 9)))
+        pieces.insert(rng.randrange(len(pieces) + 1), str(rng.randint(1, 9)))
+        lines.append("".join(pieces))
+    return "\n".join(lines)
+
+
+def day02(size, rng):
+    lines = []
+    for game_id in range(1, scaled(100, size) + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 20)} {color}" for color in colors))
+        lines.append(f"Game {game_id}: " + "; ".join(draws))
+    return "\n".join(lines)
+
+
+def day03(size, rng):
+    width = side(140, size)
+    symbols = "*#+$/@=%&-"
+    lines = []
+    for _ in range(width):
+        row = []
+        while len(row) < width:
+            roll = rng.random()
+            if roll < 0.06 and (not row or not row[-1].isdigit()):
+                digits = min(rng.randint(1, 3), width - len(row))
+                row.extend(str(rng.randint(10 ** (digits - 1), 10**digits - 1)))
+            elif roll < 0.08:
+                row.append(rng.choice(symbols))
+            else:
+                row.append(".")
+        lines.append("".join(row))
+    return "\n".join(lines)
+
+
+# fewer than one match per card on average, otherwise part 2's copy counts
+# grow exponentially with the number of cards
+MATCH_WEIGHTS = [70, 8, 6, 5, 4, 3, 2, 1, 0.5, 0.3, 0.2]
+
+
+def day04(size, rng):
+    """Cards never win copies of cards past the end of the table"""
+
+    n_cards = scaled(200, size)
+    id_width = len(str(n_cards))
+    lines = []
+    for card_id in range(1, n_cards + 1):
+        winning = rng.sample(range(1, 100), 10)
+        n_matches = rng.choices(range(11), weights=MATCH_WEIGHTS)[0]
+        n_matches = min(n_matches, n_cards - card_id)
+        others = [n for n in range(1, 100) if n not in set(winning)]
+        have = rng.sample(winning, n_matches) + rng.sample(others, 25 - n_matches)
+        rng.shuffle(have)
+        lines.append(
+            f"Card {card_id:>{id_width}}: "
+            + " ".join(f"{n:2d}" for n in winning)
+            + " | "
+            + " ".join(f"{n:2d}" for n in have)
+        )
+    return "\n".join(lines)
+
+
+def day05(size, rng):
+    """Each map's source ranges tile one contiguous span with no gaps, the
+    same as the real almanacs, part 2's gap filling depends on it"""
+
+    span = 2**32
+    chain = [
+        "seed",
+        "soil",
+        "fertilizer",
+        "water",
+        "light",
+        "temperature",
+        "humidity",
+        "location",
+    ]
+    seeds = []
+    for _ in range(scaled(10, size)):
+        seeds.extend((rng.randrange(span), rng.randint(10**7, 5 * 10**8)))
+    stanzas = ["seeds: " + " ".join(str(s) for s in seeds)]
+
+    n_ranges = scaled(30, size)
+    for source, dest in pairwise(chain):
+        cuts = sorted(rng.sample(range(1, span), n_ranges + 1))
+        pieces = list(pairwise(cuts))
+        order = list(range(len(pieces)))
+        rng.shuffle(order)
+        dest_start = rng.randrange(cuts[0])
+        lines = [f"{source}-to-{dest} map:"]
+        for i in order:
+            start, stop = pieces[i]
+            lines.append(f"{dest_start} {start} {stop - start}")
+            dest_start += stop - start
+        stanzas.append("\n".join(lines))
+    return "\n\n".join(stanzas)
+
+
+def day06(size, rng):
+    """Times have 2 digits and distances 4, so the concatenated part 2 race
+    is still winnable, the leading race decides that"""
+
+    times, distances = [], []
+    for _ in range(scaled(4, size)):
+        time = rng.randint(70, 99)
+        times.append(time)
+        distances.append(rng.randint(1000, time * time // 4 - 1))
+    return "\n".join(
+        [
+            "Time:    " + "".join(f"{t:>6}" for t in times),
+            "Distance:" + "".join(f"{d:>6}" for d in distances),
+        ]
+    )
+
+
+def day07(size, rng):
+    """Hands are unique, equal hands tie on hand_key() and would rank by bid"""
+
+    n_hands = scaled(1000, size)
+    if n_hands > 13**5:
+        raise ValueError(f"only {13**5} distinct hands exist, asked for {n_hands}")
+    hands = set()
+    while len(hands) < n_hands:
+        hands.add("".join(rng.choices("AKQJT98765432", k=5)))
+    hands = sorted(hands)
+    rng.shuffle(hands)
+    return "\n".join(f"{hand} {rng.randint(1, 1000)}" for hand in hands)
+
+
+def day08(size, rng):
+    """Every ghost walks a loop whose first Z is exactly one loop long
+
+    That's the property that makes part 2's lcm() right. Loops are
+    len(directions) times a small prime long, so the directions matter."""
+
+    primes = [3, 5, 7, 11, 13, 17]
+    n_dirs = next(n for n in range(max(2, round(13 * size)), 10**9) if is_prime(n))
+    directions = "".join(rng.choices("LR", k=n_dirs))
+
+    total = n_dirs * sum(primes) + len(primes)
+    middles = iter(names(rng, total, ascii_uppercase[1:-1]))
+    ends = names(rng, len(primes), ascii_uppercase[1:-1])
+    width = len(ends[0])
+
+    links = {}
+    for ghost, prime in enumerate(primes):
+        if ghost == 0:
+            start, finish = "AAA", "ZZZ"
+        else:
+            start = ends[ghost][: width - 1] + "A"
+            finish = ends[ghost][: width - 1] + "Z"
+        length = n_dirs * prime
+        loop = [start] + [next(middles) for _ in range(length - 1)] + [finish]
+        for i, node in enumerate(loop):
+            # from the Z, the next step lines up with the first step again
+            nxt = loop[i + 1] if i < length else loop[1]
+            other = rng.choice(loop)
+            links[node] = (
+                (nxt, other) if directions[i % n_dirs] == "L" else (other, nxt)
+            )
+
+    nodes = list(links)
+    rng.shuffle(nodes)
+    lines = [f"{node} = ({links[node][0]}, {links[node][1]})" for node in nodes]
+    return directions + "\n\n" + "\n".join(lines)
+
+
+def day09(size, rng):
+    """Each history is a polynomial, so differencing always reaches zeros"""
+
+    lines = []
+    for _ in range(scaled(200, size)):
+        coefficients = [rng.randint(-9, 9) for _ in range(rng.randint(2, 10))]
+        values = [
+            sum(a * math.comb(x, k) for k, a in enumerate(coefficients))
+            for x in range(21)
+        ]
+        lines.append(" ".join(str(v) for v in values))
+    return "\n".join(lines)
+
+
+PIPES = {
+    frozenset("NS"): "|",
+    frozenset("EW"): "-",
+    frozenset("NE"): "L",
+    frozenset("NW"): "J",
+    frozenset("SW"): "7",
+    frozenset("SE"): "F",
+}
+PIPE_OPENINGS = {pipe: set(openings) for openings, pipe in PIPES.items()}
+
+
+def heading(here, there) -> str:
+    """Compass direction from ``here`` to ``there``, in a straight line"""
+
+    dr, dc = there[0] - here[0], there[1] - here[1]
+    return {(-1, 0): "N", (1, 0): "S", (0, 1): "E", (0, -1): "W"}[
+        ((dr > 0) - (dr < 0), (dc > 0) - (dc < 0))
+    ]
+
+
+def day10(size, rng):
+    """One loop with S on it, and no junk pipe points into S, part 2 wants
+    exactly two connections there"""
+
+    n = side(46, size, minimum=2)
+    loop = tree_loop(n, n, rng, block=2)
+    rows = cols = 3 * n + 1
+
+    grid = [[rng.choice("|-LJ7F.") for _ in range(cols)] for _ in range(rows)]
+    for i, here in enumerate(loop):
+        prev, nxt = loop[i - 1], loop[(i + 1) % len(loop)]
+        grid[here[0]][here[1]] = PIPES[
+            frozenset((heading(here, prev), heading(here, nxt)))
+        ]
+
+    s_row, s_col = rng.choice(loop)
+    grid[s_row][s_col] = "S"
+    on_loop = set(loop)
+    for direction, back in (("N", "S"), ("S", "N"), ("E", "W"), ("W", "E")):
+        dr, dc = {"N": (-1, 0), "S": (1, 0), "E": (0, 1), "W": (0, -1)}[direction]
+        r, c = s_row + dr, s_col + dc
+        if 0 <= r < rows and 0 <= c < cols and (r, c) not in on_loop:
+            if back in PIPE_OPENINGS.get(grid[r][c], ()):
+                grid[r][c] = "."
+    return "\n".join("".join(row) for row in grid)
+
+
+def day11(size, rng):
+    width = side(140, size)
+    empty_rows = set(rng.sample(range(width), width // 20))
+    empty_cols = set(rng.sample(range(width), width // 20))
+    lines = []
+    for r in range(width):
+        lines.append(
+            "".join(
+                "#"
+                if r not in empty_rows and c not in empty_cols and rng.random() < 0.023
+                else "."
+                for c in range(width)
+            )
+        )
+    return "\n".join(lines)
+
+
+def day12(size, rng):
+    """Rows are built from a real arrangement, so each has at least one"""
+
+    lines = []
+    for _ in range(scaled(1000, size)):
+        groups = [rng.randint(1, 5) for _ in range(rng.randint(1, 5))]
+        springs = "." * rng.randint(0, 2)
+        for i, group in enumerate(groups):
+            if i:
+                springs += "." * rng.randint(1, 2)
+            springs += "#" * group
+        springs += "." * rng.randint(0, 2)
+        springs = springs[:20] if len(springs) > 20 else springs
+        unknown = rng.uniform(0.3, 0.6)
+        row = "".join("?" if rng.random() < unknown else ch for ch in springs)
+        counts = [len(chunk) for chunk in springs.split(".") if chunk]
+        lines.append(f"{row} {','.join(str(c) for c in counts)}")
+    return "\n".join(lines)
+
+
+def day13(size, rng):
+    """Every pattern has a perfect reflection one way and a one-smudge
+    reflection the other, so both parts find something"""
+
+    blocks = []
+    for _ in range(scaled(100, size)):
+        half_rows = rng.randint(2, 6)
+        half_cols = rng.randint(2, 7)
+
+        def mirrored_row():
+            half = rng.choices("#.", k=half_cols)
+            return half + half[::-1]
+
+        top = [mirrored_row() for _ in range(half_rows)]
+        extra = mirrored_row()
+        smudge = rng.randrange(2 * half_cols)
+        extra[smudge] = "#" if extra[smudge] == "." else "."
+        rows = [extra, *top, *top[::-1]]
+
+        if rng.random() < 0.5:
+            rows = [list(col) for col in zip(*rows)]
+        blocks.append("\n".join("".join(row) for row in rows))
+    return "\n\n".join(blocks)
+
+
+def day14(size, rng):
+    width = side(100, size)
+    return "\n".join(
+        "".join(rng.choices("O#.", weights=(20, 18, 62), k=width)) for _ in range(width)
+    )
+
+
+def day15(size, rng):
+    labels = [
+        "".join(rng.choices(ascii_lowercase, k=rng.randint(2, 6)))
+        for _ in range(scaled(500, size))
+    ]
+    steps = []
+    for _ in range(scaled(4000, size)):
+        label = rng.choice(labels)
+        if rng.random() < 0.3:
+            steps.append(f"{label}-")
+        else:
+            steps.append(f"{label}={rng.randint(1, 9)}")
+    return ",".join(steps)
+
+
+def day16(size, rng):
+    width = side(110, size)
+    return "\n".join(
+        "".join(rng.choices(".\\/|-", weights=(90, 3, 3, 2, 2), k=width))
+        for _ in range(width)
+    )
+
+
+def day17(size, rng):
+    width = side(141, size)
+    return "\n".join("".join(rng.choices("123456789", k=width)) for _ in range(width))
+
+
+def day18(size, rng):
+    """A closed rectilinear outline that doesn't cross itself, both as the
+    small "R 6" steps and as the big hex-coded steps"""
+
+    n = side(8, size, minimum=2)
+    loop = tree_loop(n, n, rng, block=1)
+    corners = [
+        here
+        for i, here in enumerate(loop)
+        if heading(loop[i - 1], here) != heading(here, loop[(i + 1) % len(loop)])
+    ]
+
+    def stretch(max_gap):
+        # spread the grid lines out unevenly, keeping their order
+        rows, cols = [0], [0]
+        for _ in range(2 * n):
+            rows.append(rows[-1] + rng.randint(1, max_gap))
+            cols.append(cols[-1] + rng.randint(1, max_gap))
+        return rows, cols
+
+    small = stretch(3)
+    # hex lengths have five digits, even a full-width edge has to fit
+    big = stretch(0xFFFFF // (2 * n))
+    lines = []
+    for here, there in zip(corners, corners[1:] + corners[:1]):
+        direction = heading(here, there)
+        if here[0] == there[0]:
+            small_len = abs(small[1][there[1]] - small[1][here[1]])
+            big_len = abs(big[1][there[1]] - big[1][here[1]])
+        else:
+            small_len = abs(small[0][there[0]] - small[0][here[0]])
+            big_len = abs(big[0][there[0]] - big[0][here[0]])
+        letter = {"N": "U", "S": "D", "E": "R", "W": "L"}[direction]
+        code = {"R": 0, "D": 1, "L": 2, "U": 3}[letter]
+        lines.append(f"{letter} {small_len} (#{big_len:05x}{code})")
+    return "\n".join(lines)
+
+
+def day19(size, rng):
+    """The workflows form a tree and every rule splits the range that can
+    reach it into two pieces at least two values wide, which is what
+    WildCardPart.constrain() can handle"""
+
+    n_flows = scaled(550, size)
+    flow_names = iter(names(rng, n_flows, ascii_lowercase, width=2))
+    full = dict.fromkeys("xmas", (1, 4000))
+    queue = [("in", full)]
+    made = 1
+    lines = []
+
+    def destination(ranges):
+        nonlocal made
+        if made < n_flows and rng.random() < 0.75:
+            name = next(flow_names)
+            while name == "in":
+                name = next(flow_names)
+            made += 1
+            queue.append((name, ranges))
+            return name
+        return rng.choice("AR")
+
+    while queue:
+        name, ranges = queue.pop(0)
+        rules = []
+        for _ in range(rng.randint(1, 3)):
+            splittable = [k for k, (lo, hi) in ranges.items() if hi - lo >= 3]
+            if not splittable:
+                break
+            key = rng.choice(splittable)
+            lo, hi = ranges[key]
+            if rng.random() < 0.5:
+                value = rng.randint(lo + 2, hi - 1)
+                passed, failed = (lo, value - 1), (value, hi)
+                rule = f"{key}<{value}"
+            else:
+                value = rng.randint(lo + 1, hi - 2)
+                passed, failed = (value + 1, hi), (lo, value)
+                rule = f"{key}>{value}"
+            rules.append(f"{rule}:{destination({**ranges, key: passed})}")
+            ranges = {**ranges, key: failed}
+        rules.append(destination(ranges))
+        lines.append(f"{name}{{{','.join(rules)}}}")
+
+    parts = [
+        "{" + ",".join(f"{key}={rng.randint(1, 4000)}" for key in "xmas") + "}"
+        for _ in range(scaled(200, size))
+    ]
+    return "\n".join(lines) + "\n\n" + "\n".join(parts)
+
+
+def day20(size, rng):
+    """Four binary counters, one per rx feeder, like the real input
+
+    Part 2 only watches the feeders called xn, qn, xf and zl, so those names
+    are fixed. Each counter resets after a prime number of presses and
+    ``size`` adds counter bits, so part 2 runs about size times longer."""
+
+    bits = 12 + max(0, round(math.log2(size)))
+    feeders = ["xn", "qn", "xf", "zl"]
+    taken = {*feeders, "rx"}
+    pool = [n for n in names(rng, 4 * bits + 10, ascii_lowercase, 2) if n not in taken]
+    final = pool.pop()
+
+    primes = [n for n in range(2 ** (bits - 1) + 1, 2**bits, 2) if is_prime(n)]
+    lines = []
+    firsts = []
+    for feeder, period in zip(feeders, rng.sample(primes, len(feeders))):
+        flops = [pool.pop() for _ in range(bits)]
+        hub = pool.pop()
+        firsts.append(flops[0])
+        hub_dests = [feeder]
+        for bit, flop in enumerate(flops):
+            dests = [flops[bit + 1]] if bit + 1 < bits else []
+            if period >> bit & 1:
+                dests.append(hub)
+            if not period >> bit & 1 or bit == 0:
+                hub_dests.append(flop)
+            rng.shuffle(dests)
+            lines.append(f"%{flop} -> {', '.join(dests)}")
+        rng.shuffle(hub_dests)
+        lines.append(f"&{hub} -> {', '.join(hub_dests)}")
+        lines.append(f"&{feeder} -> {final}")
+    lines.append(f"&{final} -> rx")
+    rng.shuffle(lines)
+    return f"broadcaster -> {', '.join(firsts)}\n" + "\n".join(lines)
+
+
+def day21(size, rng):
+    """Odd-sized square with S in the middle and its row, column and the
+    border left clear, part 2's extrapolation needs those"""
+
+    width = side(131, size) | 1
+    middle = width // 2
+    lines = []
+    for r in range(width):
+        row = []
+        for c in range(width):
+            if r == c == middle:
+                row.append("S")
+            elif r in (0, middle, width - 1) or c in (0, middle, width - 1):
+                row.append(".")
+            else:
+                row.append("#" if rng.random() < 0.12 else ".")
+        lines.append("".join(row))
+    return "\n".join(lines)
+
+
+def day22(size, rng):
+    """Bricks don't overlap in the snapshot. Part 2 numbers bricks in an
+    int16 array, so there's an upper limit on how many"""
+
+    n_bricks = scaled(1250, size)
+    if n_bricks >= 2**15:
+        raise ValueError(f"day 22 part 2 can't index {n_bricks} bricks in int16")
+    width = side(10, size, minimum=3)
+    height = max(10, n_bricks * 25 // (width * width))
+
+    occupied = set()
+    lines = []
+    while len(lines) < n_bricks:
+        axis = rng.choices((0, 1, 2), weights=(4, 4, 2))[0]
+        length = rng.randint(0, 4)
+        start = [rng.randrange(width), rng.randrange(width), rng.randint(1, height)]
+        end = list(start)
+        end[axis] += length
+        if end[0] >= width or end[1] >= width:
+            continue
+        cubes = {
+            (x, y, z)
+            for x in range(start[0], end[0] + 1)
+            for y in range(start[1], end[1] + 1)
+            for z in range(start[2], end[2] + 1)
+        }
+        if cubes & occupied:
+            continue
+        occupied |= cubes
+        lines.append(",".join(map(str, start)) + "~" + ",".join(map(str, end)))
+    return "\n".join(lines)
+
+
+def staircase(rng: random.Random, fixed: int, lo: int, hi: int, band: int) -> list:
+    """A winding trail from (fixed, lo) to (fixed, hi) that stays within
+    ``band`` of ``fixed``. Its legs are two apart, so no cell on it touches
+    another one it isn't next to along the trail."""
+
+    path = []
+    here, along = fixed, lo
+    while along < hi - 2:
+        path.extend([(here, along), (here, along + 1)])
+        along += 2
+        target = rng.randint(fixed - band, fixed + band) if along < hi - 2 else fixed
+        step = 1 if target > here else -1
+        path.extend((r, along) for r in range(here, target, step))
+        here = target
+    path.extend((here, a) for a in range(along, hi + 1))
+    return path
+
+
+def day23(size, rng):
+    """6x6 junctions joined by winding one-wide trails, like the real maze
+
+    take_a_hike() is exponential in the number of junctions, so ``size``
+    stretches the trails between them instead of adding more."""
+
+    k = 6
+    band = 4
+    spacing = max(2 * band + 8, round(22 * math.sqrt(size)))
+    offset = band + 2
+    n = offset + (k - 1) * spacing + band + 2
+    grid = [["#"] * n for _ in range(n)]
+    junction = [offset + i * spacing for i in range(k)]
+
+    def carve(cells, transpose=False):
+        for a, b in cells:
+            r, c = (b, a) if transpose else (a, b)
+            grid[r][c] = "."
+
+    for i in range(k):
+        for j in range(k):
+            grid[junction[i]][junction[j]] = "."
+            if j + 1 < k:
+                lo, hi = junction[j] + band + 2, junction[j + 1] - band - 2
+                carve((junction[i], c) for c in range(junction[j] + 1, lo))
+                carve(staircase(rng, junction[i], lo, hi, band))
+                carve((junction[i], c) for c in range(hi + 1, junction[j + 1]))
+                grid[junction[i]][junction[j] + 1] = ">"
+            if i + 1 < k:
+                lo, hi = junction[i] + band + 2, junction[i + 1] - band - 2
+                carve(((junction[j], r) for r in range(junction[i] + 1, lo)), True)
+                carve(staircase(rng, junction[j], lo, hi, band), True)
+                carve(((junction[j], r) for r in range(hi + 1, junction[i + 1])), True)
+                grid[junction[i] + 1][junction[j]] = "v"
+
+    for r in range(junction[0]):
+        grid[r][junction[0]] = "."
+    for r in range(junction[-1] + 1, n):
+        grid[r][junction[-1]] = "."
+    return "\n".join("".join(row) for row in grid)
+
+
+def day24(size, rng):
+    """Every hailstone is on the path of one rock thrown with integer
+    position and velocity, at a distinct integer time"""
+
+    rock = [rng.randint(2 * 10**14, 4 * 10**14) for _ in range(3)]
+    rock_velocity = [rng.randint(-300, 300) for _ in range(3)]
+    used_times = set()
+    lines = []
+    while len(lines) < scaled(300, size):
+        time = rng.randint(10**11, 10**12)
+        if time in used_times:
+            continue
+        position, velocity = [], []
+        for axis in range(3):
+            drift = rng.randint(-300, 300)
+            position.append(rock[axis] + time * drift)
+            velocity.append(rock_velocity[axis] - drift)
+        if not all(10**14 <= p <= 5 * 10**14 for p in position):
+            continue
+        used_times.add(time)
+        lines.append(
+            ", ".join(map(str, position)) + " @ " + ", ".join(map(str, velocity))
+        )
+    return "\n".join(lines)
+
+
+def day25(size, rng):
+    """Two clusters where every component has at least four wires, joined by
+    exactly three wires, so the three to cut are unique"""
+
+    per_cluster = scaled(750, size)
+    components = names(rng, 2 * per_cluster, ascii_lowercase)
+    rng.shuffle(components)
+    clusters = [components[:per_cluster], components[per_cluster:]]
+
+    wires = set()
+    for cluster in clusters:
+        for component in cluster:
+            for other in rng.sample(cluster, 5):
+                if other != component:
+                    wires.add(tuple(sorted((component, other))))
+    for _ in range(3):
+        while (wire := (rng.choice(clusters[0]), rng.choice(clusters[1]))) in wires:
+            pass
+        wires.add(wire)
+
+    listed = defaultdict(list)
+    for wire in sorted(wires):
+        a, b = wire if rng.random() < 0.5 else wire[::-1]
+        listed[a].append(b)
+    lines = [f"{a}: {' '.join(bs)}" for a, bs in listed.items()]
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+GENERATORS = {
+    1: day01,
+    2: day02,
+    3: day03,
+    4: day04,
+    5: day05,
+    6: day06,
+    7: day07,
+    8: day08,
+    9: day09,
+    10: day10,
+    11: day11,
+    12: day12,
+    13: day13,
+    14: day14,
+    15: day15,
+    16: day16,
+    17: day17,
+    18: day18,
+    19: day19,
+    20: day20,
+    21: day21,
+    22: day22,
+    23: day23,
+    24: day24,
+    25: day25,
+}
+
+
+def generate(day: int, size: float = 1, seed: int = 2023) -> str:
+    if day not in GENERATORS:
+        raise LookupError(f"no generator for day {day}")
+    return GENERATORS[day](size, random.Random(seed))
@@ -0,0 +1,72 @@
+"""Character grids as flat arrays, positions as ints
+
+A position is a flat index into ``Grid.cells``, and moving is adding one of
+``Grid.offsets``. A border of ``fill`` cells goes all the way around the
+map, so a step off the edge lands on a fill cell instead of needing a
+bounds check, as long as code stops there. Directions are the integer codes
+below, in clockwise order, so reversing is arithmetic mod 4."""
+
+from functools import cached_property
+
+from advent_2023.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+NORTH, EAST, SOUTH, WEST = DIRECTIONS = range(4)
+
+
+def reverse(direction: int) -> int:
+    return (direction + 2) % 4
+
+
+class Grid:
+    def __init__(self, cells, fill=0, pad: int = 1):
+        cells = np.asarray(cells)
+        self.n_rows, self.n_cols = cells.shape
+        self.pad = pad
+        self.stride = self.n_cols + 2 * pad
+
+        padded = np.full((self.n_rows + 2 * pad, self.stride), fill, dtype=cells.dtype)
+        padded[pad : pad + self.n_rows, pad : pad + self.n_cols] = cells
+        self.cells = padded.ravel()
+        # indexed by direction code
+        self.offsets = (-self.stride, 1, self.stride, -1)
+
+    @classmethod
+    def from_text(cls, text: str, fill: str = " ", pad: int = 1):
+        """A grid of character codes, ``grid.cells[i] == ord("#")`` etc."""
+
+        lines = text.splitlines()
+        codes = np.frombuffer("".join(lines).encode(), dtype=np.uint8)
+        return cls(codes.reshape(len(lines), -1), ord(fill), pad)
+
+    def index(self, row: int, col: int) -> int:
+        """Flat index of (row, col), -1 and n_rows/n_cols reach into the fill"""
+
+        return (row + self.pad) * self.stride + col + self.pad
+
+    def position(self, index: int) -> tuple[int, int]:
+        row, col = divmod(index, self.stride)
+        return row - self.pad, col - self.pad
+
+    def step(self, index: int, direction: int) -> int:
+        return index + self.offsets[direction]
+
+    @property
+    def view(self):
+        """The map without its border, as a (n_rows, n_cols) view of cells"""
+
+        rows = self.cells.reshape(-1, self.stride)
+        return rows[
+            self.pad : self.pad + self.n_rows, self.pad : self.pad + self.n_cols
+        ]
+
+    @cached_property
+    def neighbors(self):
+        """``neighbors[i, direction]`` is the flat index next to ``i``
+
+        Only meaningful for cells inside the border. Border cells have
+        neighbors too, clipped to the array, but they aren't on the map."""
+
+        table = np.arange(len(self.cells))[:, None] + np.array(self.offsets)
+        return np.clip(table, 0, len(self.cells) - 1)
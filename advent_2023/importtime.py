@@ -0,0 +1,73 @@
+"""How long each solution module takes to import in a fresh interpreter
+
+Runs the import under ``python -X importtime`` so the report can show which
+of the module's own imports the time went to."""
+
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+from advent_2023.puzzles import Puzzle
+from advent_2023.timing import format_seconds
+
+MARKER = "-- loading solution --"
+
+# everything the runner itself needs is imported before the marker, so only
+# the solution's own imports show up after it
+SCRIPT = f"""
+import sys
+from time import perf_counter
+
+from advent_2023.puzzles import Puzzle, load
+
+puzzle = Puzzle.from_path(sys.argv[1])
+print({MARKER!r}, file=sys.stderr, flush=True)
+start = perf_counter()
+load(puzzle)
+print(perf_counter() - start)
+"""
+
+
+@dataclass
+class ImportTime:
+    puzzle: Puzzle
+    total: float
+    # top level imports the module triggered, (seconds, name), slowest first
+    imports: list[tuple[float, str]] = field(default_factory=list)
+
+    def report(self, top: int = 5) -> str:
+        heaviest = ", ".join(
+            f"{name} {format_seconds(seconds)}" for seconds, name in self.imports[:top]
+        )
+        return f"{self.puzzle!s:18} {format_seconds(self.total):>10}  {heaviest}"
+
+
+def parse_importtime(stderr: str) -> list[tuple[float, str]]:
+    """The top level imports from ``-X importtime`` output after MARKER"""
+
+    _, _, lines = stderr.partition(MARKER)
+    imports = []
+    for line in lines.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # nested imports are indented two more spaces per level
+        if name.startswith("  "):
+            continue
+        imports.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(imports, reverse=True)
+
+
+def measure(puzzle: Puzzle) -> ImportTime:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT, str(puzzle.path)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1]
+        raise RuntimeError(f"import failed: {error}")
+    return ImportTime(
+        puzzle, float(completed.stdout.split()[-1]), parse_importtime(completed.stderr)
+    )
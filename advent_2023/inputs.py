@@ -0,0 +1,221 @@
+"""Puzzle input read a piece at a time, for inputs too big to hold in memory
+
+A solve() that walks its input with ``lines()``, ``stanzas()`` or
+``fields()`` takes either the whole text, which is what the tests and the
+``__main__`` blocks pass, or the matching ``read_*()`` iterator, which reads
+the file as it goes and only ever holds a line, stanza or chunk of it. The
+runner's ``--stream`` passes the iterator to the days listed in
+``puzzles.STREAMS``."""
+
+import mmap
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+CHUNK_SIZE = 1 << 16
+RANGE_SIZE = 1 << 24
+
+
+def read_lines(path: Path) -> Iterator[str]:
+    """The lines of a file without their line endings
+
+    Same lines as ``path.read_text().strip().splitlines()``: whitespace at
+    either end of the file goes, blank lines included, and lines in between
+    are kept as they are. Every ``str.splitlines()`` separator ends a line,
+    not just newlines."""
+
+    last = None
+    # whitespace-only lines after ``last``, dropped if nothing else follows
+    blanks = []
+    with open(path) as file:
+        for raw in file:
+            for line in raw.splitlines(keepends=True):
+                if line.isspace():
+                    if last is not None:
+                        blanks.append(line)
+                    continue
+                if last is None:
+                    last = line.lstrip()
+                    continue
+                yield last.splitlines()[0]
+                for blank in blanks:
+                    yield blank.splitlines()[0]
+                blanks.clear()
+                last = line
+    if last is not None:
+        yield last.rstrip()
+
+
+def read_stanzas(path: Path) -> Iterator[str]:
+    """Blocks of lines separated by blank lines, each joined back together
+    like ``path.read_text().strip().split("\\n\\n")``
+
+    Unlike split(), a run of several blank lines is a single separator
+    rather than leaving empty or newline-led stanzas behind. Whitespace-only
+    lines don't separate stanzas, same as with split()."""
+
+    stanza = []
+    for line in read_lines(path):
+        if line:
+            stanza.append(line)
+        elif stanza:
+            yield "\n".join(stanza)
+            stanza = []
+    if stanza:
+        yield "\n".join(stanza)
+
+
+def read_fields(path: Path, sep: str = ",") -> Iterator[str]:
+    """``path.read_text().strip().split(sep)`` for a file that may be one
+    enormous line, read CHUNK_SIZE characters at a time"""
+
+    rest = None
+    with open(path) as file:
+        while chunk := file.read(CHUNK_SIZE):
+            if rest is None:
+                chunk = chunk.lstrip()
+                if not chunk:
+                    continue
+                rest = ""
+            *items, rest = (rest + chunk).split(sep)
+            yield from items
+    # an empty file is one empty field, like "".split(sep)
+    yield "" if rest is None else rest.rstrip()
+
+
+@contextmanager
+def mapped(path: Path):
+    """The raw bytes of a file as a read-only mmap
+
+    Slicing and ``find()`` work like on bytes, the OS pages the file in as
+    it's touched. An empty file gives ``b""``, mmap can't map zero bytes."""
+
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield view
+
+
+def line_ranges(data: bytes, size: int = RANGE_SIZE) -> list[tuple[int, int]]:
+    """``(start, end)`` offsets cutting ``data`` into pieces of about
+    ``size`` bytes, each ending just after a newline or at the end
+
+    For splitting a mapped() file between worker processes, which each
+    read their own piece with read_range()."""
+
+    ranges = []
+    start = 0
+    while start < len(data):
+        end = data.find(b"\n", start + size - 1)
+        end = len(data) if end == -1 else end + 1
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def read_range(path: Path, start: int, end: int) -> str:
+    """The text between two byte offsets of a file, see line_ranges()"""
+
+    with mapped(path) as data:
+        return data[start:end].decode()
+
+
+def lines(input_data: str | Iterable[str]) -> Iterator[str]:
+    """The input's lines, from the text or from read_lines()"""
+
+    if isinstance(input_data, str):
+        return iter(input_data.splitlines())
+    return iter(input_data)
+
+
+def stanzas(input_data: str | Iterable[str]) -> Iterator[str]:
+    """The input's blank-line separated blocks, from the text or read_stanzas()"""
+
+    if isinstance(input_data, str):
+        return iter(input_data.split("\n\n"))
+    return iter(input_data)
+
+
+def fields(input_data: str | Iterable[str], sep: str = ",") -> Iterator[str]:
+    """The input split on ``sep``, from the text or read_fields()"""
+
+    if isinstance(input_data, str):
+        return iter(input_data.split(sep))
+    return iter(input_data)
+
+
+# Only defined under pytest, so a plain import skips pytest
+if "pytest" in sys.modules:
+    import pytest
+
+    TEXTS = {
+        "plain": "a\nb\nc\n",
+        "no final newline": "a\nb",
+        "blank lines": "\n\n  a\n\n\nb\n\n",
+        "whitespace lines": " \t\na\n  \nb \n \n",
+        "crlf": "a\r\nb\r\n\r\nc\r\n\r\n",
+        "other separators": "  x\x0by\x85z\u2028w\x1c\n",
+        "empty": "",
+        "only blanks": "\n \n\t\n",
+    }
+
+    def write(path: Path, text: str) -> Path:
+        # bytes, so the line endings are exactly what the test says
+        path.write_bytes(text.encode())
+        return path
+
+    @pytest.mark.parametrize("text", TEXTS.values(), ids=TEXTS.keys())
+    def test_read_lines(tmp_path, text) -> None:
+        path = write(tmp_path / "input.txt", text)
+        assert list(read_lines(path)) == path.read_text().strip().splitlines()
+
+    STANZA_TEXTS = {
+        "plain": "a\nb\n\nc\n",
+        "blank lines": "\n\na\nb\n\nc\nd\n\n\n",
+        "crlf": "a\r\nb\r\n\r\nc\r\n\r\n",
+        "whitespace line": "a\n \nb\n\nc",
+        "empty": "",
+    }
+
+    @pytest.mark.parametrize("text", STANZA_TEXTS.values(), ids=STANZA_TEXTS.keys())
+    def test_read_stanzas(tmp_path, text) -> None:
+        path = write(tmp_path / "input.txt", text)
+        expected = path.read_text().strip().split("\n\n")
+        assert list(read_stanzas(path)) == [stanza for stanza in expected if stanza]
+
+    def test_read_stanzas_blank_run(tmp_path) -> None:
+        path = write(tmp_path / "input.txt", "a\n\n\n\nb\n")
+        assert list(read_stanzas(path)) == ["a", "b"]
+
+    FIELD_TEXTS = {
+        "plain": "rn=1,cm-,qp=3",
+        "trailing newline": "rn=1,cm-\n",
+        "surrounding whitespace": " \n rn=1,,cm-,\r\n\r\n",
+        "empty fields": ",,",
+        "empty": "",
+    }
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5, CHUNK_SIZE])
+    @pytest.mark.parametrize("text", FIELD_TEXTS.values(), ids=FIELD_TEXTS.keys())
+    def test_read_fields(tmp_path, monkeypatch, text, chunk_size) -> None:
+        monkeypatch.setitem(globals(), "CHUNK_SIZE", chunk_size)
+        path = write(tmp_path / "input.txt", text)
+        assert list(read_fields(path)) == path.read_text().strip().split(",")
+
+    @pytest.mark.parametrize("size", [1, 2, 5, RANGE_SIZE])
+    @pytest.mark.parametrize("text", TEXTS.values(), ids=TEXTS.keys())
+    def test_line_ranges(tmp_path, text, size) -> None:
+        path = write(tmp_path / "input.txt", text)
+        with mapped(path) as data:
+            ranges = line_ranges(data, size)
+        ends = [0] + [end for _, end in ranges]
+        assert [start for start, _ in ranges] == ends[:-1]
+        assert ends[-1] == len(text.encode())
+
+        pieces = [read_range(path, start, end) for start, end in ranges]
+        assert "".join(pieces) == text
+        assert all(piece.endswith("\n") for piece in pieces[:-1])
@@ -0,0 +1,34 @@
+"""Imports that wait until the module is actually used"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name: str):
+    """``np = lazy_import("numpy")`` binds ``np`` right away and imports
+    numpy on the first attribute lookup (the importlib docs recipe)
+
+    Only for top-level packages: finding a submodule imports its parent."""
+
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def finish_lazy_imports(module):
+    """Load every lazy_import() ``module`` made that hasn't loaded yet, so
+    the import doesn't land in the middle of something being measured"""
+
+    for value in list(vars(module).values()):
+        if isinstance(value, importlib.util._LazyModule):
+            # any attribute lookup finishes the import
+            _ = value.__name__
@@ -0,0 +1,222 @@
+"""How much memory a solve() needs, and which lines allocate it
+
+``traced_peak()`` is the cheap in-process number bench records. ``measure()``
+runs the solve twice in fresh interpreters, so nothing from other days is
+counted: once untraced for the process's peak RSS, and once under
+tracemalloc for the peak of Python allocations and the call sites holding
+the most memory near that peak."""
+
+import json
+import linecache
+import resource
+import subprocess
+import sys
+import threading
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from advent_2023.lazy import finish_lazy_imports
+from advent_2023.puzzles import Puzzle, load
+
+
+def traced_peak(func, *args) -> tuple[object, int]:
+    """Call ``func(*args)`` and return its result with the peak bytes
+    tracemalloc saw allocated during the call"""
+
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+    return result, peak - baseline
+
+
+def format_bytes(size: int) -> str:
+    if size >= 2**20:
+        return f"{size / 2**20:.1f} MB"
+    if size >= 2**10:
+        return f"{size / 2**10:.1f} kB"
+    return f"{size} B"
+
+
+def max_rss() -> int:
+    """The process's peak resident set size so far, in bytes"""
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes everywhere except macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PeakSnapshots(threading.Thread):
+    """Takes a tracemalloc snapshot each time traced memory reaches a new
+    high, checking every ``interval`` seconds
+
+    A peak between two checks is missed, so the call sites are the ones
+    holding memory close to the peak rather than at exactly it."""
+
+    def __init__(self, interval: float = 0.01, growth: float = 1.1):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.growth = growth
+        self.snapshot = None
+        self.snapshot_bytes = 0
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self.snapshot_bytes * self.growth:
+                self.snapshot = tracemalloc.take_snapshot()
+                self.snapshot_bytes = current
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+@dataclass
+class CallSite:
+    location: str
+    source: str
+    size: int
+    count: int
+
+    def row(self) -> str:
+        return (
+            f"  {format_bytes(self.size):>10} {self.count:>11,} blocks"
+            f"  {self.location}  {self.source}"
+        )
+
+
+def call_sites(snapshot: tracemalloc.Snapshot, top: int) -> list[CallSite]:
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        )
+    )
+    sites = []
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        path = Path(frame.filename)
+        sites.append(
+            CallSite(
+                f"{path.parent.name}/{path.name}:{frame.lineno}",
+                linecache.getline(frame.filename, frame.lineno).strip()[:60],
+                stat.size,
+                stat.count,
+            )
+        )
+    return sites
+
+
+def measure_here(
+    puzzle_path: Path, input_path: Path, traced: bool, top: int = 5
+) -> dict:
+    """One measurement in this process, see measure()"""
+
+    puzzle = Puzzle.from_path(puzzle_path)
+    module = load(puzzle)
+    finish_lazy_imports(module)
+    input_data = Path(input_path).read_text().strip()
+
+    if not traced:
+        before = max_rss()
+        module.solve(input_data, *puzzle.solve_args)
+        return {"rss_before": before, "peak_rss": max_rss()}
+
+    tracemalloc.start()
+    watcher = PeakSnapshots()
+    watcher.start()
+    try:
+        module.solve(input_data, *puzzle.solve_args)
+    finally:
+        watcher.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        # a solve quicker than one check only leaves what it kept behind
+        at_peak = watcher.snapshot is not None
+        snapshot = watcher.snapshot if at_peak else tracemalloc.take_snapshot()
+        tracemalloc.stop()
+    return {
+        "traced_peak": peak,
+        "at_peak": at_peak,
+        "sites": [asdict(site) for site in call_sites(snapshot, top)],
+    }
+
+
+@dataclass
+class MemoryReport:
+    puzzle: Puzzle
+    rss_before: int
+    peak_rss: int
+    traced_peak: int
+    # whether sites are from near the peak, or only what was left at the end
+    at_peak: bool = False
+    sites: list[CallSite] = field(default_factory=list)
+
+    def report(self) -> str:
+        grown = max(0, self.peak_rss - self.rss_before)
+        when = "near peak" if self.at_peak else "left at end"
+        lines = [
+            f"{self.puzzle!s:18} peak rss {format_bytes(self.peak_rss):>9}"
+            f" (+{format_bytes(grown)} in solve)"
+            f"  traced peak {format_bytes(self.traced_peak):>9}, top sites {when}:"
+        ]
+        lines.extend(site.row() for site in self.sites)
+        return "\n".join(lines)
+
+
+def _run_child(puzzle: Puzzle, input_path: Path, traced: bool, top: int) -> dict:
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "advent_2023.memory",
+            str(puzzle.path),
+            str(input_path),
+            "traced" if traced else "rss",
+            str(top),
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1]
+        raise RuntimeError(f"solve failed: {error}")
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def measure(
+    puzzle: Puzzle, input_path: Path | None = None, top: int = 5
+) -> MemoryReport:
+    """Peak RSS, tracemalloc peak and the ``top`` call sites of one solve()"""
+
+    input_path = input_path or puzzle.input_path
+    rss = _run_child(puzzle, input_path, False, top)
+    traced = _run_child(puzzle, input_path, True, top)
+    return MemoryReport(
+        puzzle,
+        rss["rss_before"],
+        rss["peak_rss"],
+        traced["traced_peak"],
+        traced["at_peak"],
+        [CallSite(**site) for site in traced["sites"]],
+    )
+
+
+if __name__ == "__main__":
+    puzzle_path, input_path, mode, top = sys.argv[1:]
+    result = measure_here(
+        Path(puzzle_path), Path(input_path), mode == "traced", int(top)
+    )
+    print(json.dumps(result))
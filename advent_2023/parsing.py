@@ -0,0 +1,123 @@
+"""Input parsing with the patterns compiled once
+
+``parse.parse()`` turns its format string into a regex on every call, which
+on the bigger inputs cost more than solving did. ``ints()`` and
+``int_rows()`` pull every integer out of a whole input in one regex pass
+and hand back a numpy array. ``LinePattern`` takes the same format strings
+as parse, only ``{}`` and ``{:d}`` fields, compiled once."""
+
+import re
+import sys
+
+from advent_2023.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+INT = re.compile(r"-?\d+")
+FIELD = re.compile(r"\{(:d)?\}")
+
+
+def ints(text: str):
+    """Every integer in ``text``, in order, as an int64 array"""
+
+    return np.array(INT.findall(text), dtype=np.int64)
+
+
+def int_rows(text: str, width: int):
+    """ints() as an array of rows of ``width``, e.g. one row per line"""
+
+    values = ints(text)
+    if len(values) % width:
+        raise ValueError(f"{len(values)} integers don't split into rows of {width}")
+    return values.reshape(-1, width)
+
+
+class LinePattern:
+    """``LinePattern("{} = ({}, {})").parse(line)`` works like
+    ``parse.parse("{} = ({}, {})", line)``, ``{:d}`` fields come back as
+    ints and a line that doesn't match gives None"""
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self.converters = []
+        pieces = []
+        position = 0
+        for field in FIELD.finditer(fmt):
+            pieces.append(re.escape(fmt[position : field.start()]))
+            if field.group(1):
+                pieces.append(r"([-+]?\d+)")
+                self.converters.append(int)
+            else:
+                pieces.append(r"(.+?)")
+                self.converters.append(None)
+            position = field.end()
+        pieces.append(re.escape(fmt[position:]))
+        self.regex = re.compile("".join(pieces))
+
+    def __repr__(self):
+        return f"LinePattern({self.fmt!r})"
+
+    def _convert(self, fields: tuple) -> tuple:
+        return tuple(
+            value if convert is None else convert(value)
+            for convert, value in zip(self.converters, fields)
+        )
+
+    def parse(self, line: str) -> tuple | None:
+        match = self.regex.fullmatch(line)
+        if match is None:
+            return None
+        return self._convert(match.groups())
+
+    def parse_all(self, text: str) -> list[tuple]:
+        """The fields of every line of ``text``, skipping blank lines
+
+        Unlike parse(), a line that doesn't match is a ValueError, a typo in
+        the pattern shouldn't quietly drop lines from the answer."""
+
+        rows = []
+        for line in text.splitlines():
+            if not line:
+                continue
+            match = self.regex.fullmatch(line)
+            if match is None:
+                raise ValueError(f"{line!r} doesn't match {self.fmt!r}")
+            rows.append(self._convert(match.groups()))
+        return rows
+
+
+# Only defined under pytest, so a plain import skips pytest
+if "pytest" in sys.modules:
+    import pytest
+
+    def test_ints() -> None:
+        assert ints("x=3, y=-12\n\n 40-2").tolist() == [3, -12, 40, -2]
+        assert ints("no numbers").tolist() == []
+
+    def test_int_rows() -> None:
+        rows = int_rows("1,2,3 @ -4,5,6\n7,8,9 @ 10,11,-12", 6)
+        assert rows.tolist() == [[1, 2, 3, -4, 5, 6], [7, 8, 9, 10, 11, -12]]
+        with pytest.raises(ValueError, match="don't split"):
+            int_rows("1 2 3\n4 5", 3)
+
+    def test_line_pattern_parse() -> None:
+        link = LinePattern("{} = ({}, {})")
+        assert link.parse("AAA = (BBB, CCC)") == ("AAA", "BBB", "CCC")
+        assert link.parse("AAA = (BBB, CCC) ") is None
+        assert link.parse("AAA (BBB, CCC)") is None
+
+        game = LinePattern("Game {:d}: {}")
+        assert game.parse("Game 12: 3 blue") == (12, "3 blue")
+        assert game.parse("Game -1: x") == (-1, "x")
+        assert game.parse("Game one: x") is None
+        # regex characters in the format are literal
+        assert LinePattern("{:d}.{:d}*").parse("1.2*") == (1, 2)
+        assert LinePattern("{:d}.{:d}*").parse("1x2*") is None
+
+    def test_line_pattern_parse_all() -> None:
+        link = LinePattern("{} = ({}, {})")
+        text = "AAA = (BBB, CCC)\n\nBBB = (DDD, EEE)\n"
+        assert link.parse_all(text) == [("AAA", "BBB", "CCC"), ("BBB", "DDD", "EEE")]
+        assert link.parse_all("") == []
+        with pytest.raises(ValueError, match="'BBB = DDD, EEE'"):
+            link.parse_all("AAA = (BBB, CCC)\nBBB = DDD, EEE")
@@ -0,0 +1,268 @@
+"""Profile one solve() call with cProfile, and optionally line by line
+
+Without targets the whole of solve() is profiled. With targets, e.g.
+"ScoreKeeper.solve", the profiler only runs while one of them is on the
+stack. ``write_profile()`` saves
+
+- ``solve.prof``, the cProfile stats for ``python -m pstats`` or snakeviz
+- ``solve.collapsed``, one ``frame;frame;frame microseconds`` line per
+  stack for flamegraph.pl or speedscope. cProfile only records caller and
+  callee pairs, so a function's time is split between the stacks leading
+  to it in proportion to the time each caller spent in it.
+- ``top.txt``, the functions with the most time of their own
+- ``lines.txt`` with ``lines``, time and hits per line of the targets
+"""
+
+import cProfile
+import inspect
+import pstats
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+
+from advent_2023.lazy import finish_lazy_imports
+from advent_2023.puzzles import DAYS_DIR, Puzzle, load
+from advent_2023.runner import read_input
+from advent_2023.timing import (
+    PhaseTimer,
+    find_functions,
+    format_seconds,
+    timed_functions,
+)
+
+PROFILE_DIR = DAYS_DIR.parent / "profiles"
+
+# stacks cheaper than this are left out of solve.collapsed
+MIN_STACK_SECONDS = 1e-6
+
+
+class ProfiledPhase(PhaseTimer):
+    """A PhaseTimer that has cProfile running while inside its functions"""
+
+    def __init__(self, profiler: cProfile.Profile):
+        super().__init__()
+        self.profiler = profiler
+
+    def _enter(self):
+        super()._enter()
+        if self._depth == 1:
+            self.profiler.enable()
+
+    def _exit(self):
+        if self._depth == 1:
+            self.profiler.disable()
+        super()._exit()
+
+
+class LineTimer:
+    """Hits and wall time for each line of some functions, with sys.settrace
+
+    A line's time runs until the next line event in the same frame, so it
+    includes the calls made on that line. Tracing costs a lot per line, the
+    numbers are for comparing lines with each other."""
+
+    def __init__(self, functions: dict):
+        self.functions = functions
+        self.codes = {func.__code__ for func in functions.values()}
+        self.hits = Counter()
+        self.seconds = defaultdict(float)
+
+    def _trace_call(self, frame, event, arg):
+        if frame.f_code not in self.codes:
+            return None
+
+        code = frame.f_code
+        # the line being timed and when it started, per call (or generator
+        # resume) of the traced function
+        line, started = None, perf_counter()
+
+        def trace_line(frame, event, arg):
+            nonlocal line, started
+            now = perf_counter()
+            if line is not None:
+                self.seconds[code, line] += now - started
+            line = frame.f_lineno if event == "line" else None
+            if line is not None:
+                self.hits[code, line] += 1
+            started = perf_counter()
+            return trace_line
+
+        return trace_line
+
+    def runcall(self, func, *args):
+        previous = sys.gettrace()
+        sys.settrace(self._trace_call)
+        try:
+            return func(*args)
+        finally:
+            sys.settrace(previous)
+
+    def report(self) -> str:
+        lines = []
+        for name, func in self.functions.items():
+            code = func.__code__
+            source, first = inspect.getsourcelines(func)
+            total = sum(t for (c, _), t in self.seconds.items() if c is code)
+            lines.append(f"{name}  {format_seconds(total)}")
+            lines.append(f"{'line':>6} {'hits':>10} {'time':>12} {'%':>6}  source")
+            for lineno, text in enumerate(source, start=first):
+                hits = self.hits.get((code, lineno), 0)
+                seconds = self.seconds.get((code, lineno), 0.0)
+                if hits:
+                    share = 100 * seconds / total if total else 0.0
+                    timing = f"{hits:>10,} {format_seconds(seconds):>12} {share:>6.1f}"
+                else:
+                    timing = f"{'':10} {'':12} {'':6}"
+                lines.append(f"{lineno:>6} {timing}  {text.rstrip()}")
+            lines.append("")
+        return "\n".join(lines)
+
+
+def describe(func: tuple) -> str:
+    """A pstats (file, line, name) key as ``name (dir/file:line)``"""
+
+    filename, lineno, name = func
+    if filename == "~":
+        return name
+    path = Path(filename)
+    return f"{name} ({path.parent.name}/{path.name}:{lineno})"
+
+
+def _is_profiler(func: tuple) -> bool:
+    # turning the profiler on and off in targeted runs, not the puzzle's time
+    return func[0] == __file__ or "_lsprof.Profiler" in func[2]
+
+
+def top_functions(stats: pstats.Stats, top: int = 15) -> str:
+    rows = sorted(
+        (
+            (tt, ct, nc, func)
+            for func, (_, nc, tt, ct, _) in stats.stats.items()
+            if not _is_profiler(func)
+        ),
+        reverse=True,
+    )
+    lines = [f"{'own time':>12} {'cumulative':>12} {'calls':>12}  function"]
+    for tt, ct, nc, func in rows[:top]:
+        lines.append(
+            f"{format_seconds(tt):>12} {format_seconds(ct):>12} {nc:>12,}"
+            f"  {describe(func)}"
+        )
+    return "\n".join(lines)
+
+
+def call_graph(stats: pstats.Stats) -> tuple[list, dict]:
+    """The functions nothing profiled called, and for each function the
+    (callee, seconds in callee when called from here) pairs"""
+
+    roots = []
+    callees = defaultdict(list)
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        if _is_profiler(func):
+            continue
+        known_callers = [c for c in callers if c in stats.stats and not _is_profiler(c)]
+        if not known_callers:
+            roots.append(func)
+        for caller in known_callers:
+            callees[caller].append((func, callers[caller][3]))
+    return roots, callees
+
+
+def collapsed_stacks(stats: pstats.Stats) -> list[str]:
+    """Stacks in the folded format flame graph tools read, see module doc"""
+
+    roots, callees = call_graph(stats)
+    weights = Counter()
+
+    def walk(func, stack, seconds):
+        _, _, tt, ct, _ = stats.stats[func]
+        if ct <= 0:
+            return
+        stack = (*stack, func)
+        weights[stack] += seconds * tt / ct
+        for callee, edge_seconds in callees[func]:
+            # recursion is already counted in the caller's cumulative time
+            if callee in stack:
+                continue
+            share = seconds * edge_seconds / ct
+            if share >= MIN_STACK_SECONDS:
+                walk(callee, stack, share)
+
+    for root in roots:
+        walk(root, (), stats.stats[root][3])
+
+    return [
+        f"{';'.join(describe(f).replace(';', ',') for f in stack)} {round(s * 1e6)}"
+        for stack, s in sorted(weights.items())
+        if round(s * 1e6) > 0
+    ]
+
+
+@dataclass
+class Profile:
+    puzzle: Puzzle
+    answer: object
+    stats: pstats.Stats
+    targets: tuple[str, ...] = ()
+    line_timer: LineTimer | None = None
+
+
+def profile_puzzle(
+    puzzle: Puzzle,
+    input_path: Path | None = None,
+    targets: tuple[str, ...] = (),
+    lines: bool = False,
+    stream: bool = False,
+) -> Profile:
+    """Profile one call of the puzzle's solve(), see the module docstring
+
+    ``lines`` times the targets (or solve() itself if there are none) line
+    by line, in a second call so it doesn't slow down the cProfile one."""
+
+    module = load(puzzle)
+    finish_lazy_imports(module)
+    input_path = input_path or puzzle.input_path
+
+    functions = find_functions(module, targets)
+    missing = [name for name in targets if name not in functions]
+    if missing:
+        raise LookupError(f"{puzzle} has no function {', '.join(missing)}")
+
+    profiler = cProfile.Profile()
+    input_data = read_input(puzzle, input_path, stream)
+    if targets:
+        with timed_functions(module, targets, ProfiledPhase(profiler)):
+            answer = module.solve(input_data, *puzzle.solve_args)
+    else:
+        answer = profiler.runcall(module.solve, input_data, *puzzle.solve_args)
+    stats = pstats.Stats(profiler)
+
+    line_timer = None
+    if lines:
+        line_timer = LineTimer(functions or {"solve": module.solve})
+        input_data = read_input(puzzle, input_path, stream)
+        line_timer.runcall(module.solve, input_data, *puzzle.solve_args)
+
+    return Profile(puzzle, answer, stats, tuple(targets), line_timer)
+
+
+def write_profile(
+    profile: Profile, directory: Path = PROFILE_DIR, top: int = 15
+) -> Path:
+    """Write the files listed in the module docstring to
+    ``directory/dayNN-partP/``, and return that"""
+
+    puzzle = profile.puzzle
+    out = Path(directory) / f"day{puzzle.day:02d}-part{puzzle.part}"
+    out.mkdir(parents=True, exist_ok=True)
+
+    profile.stats.dump_stats(out / "solve.prof")
+    (out / "solve.collapsed").write_text(
+        "\n".join(collapsed_stacks(profile.stats)) + "\n"
+    )
+    (out / "top.txt").write_text(top_functions(profile.stats, top) + "\n")
+    if profile.line_timer is not None:
+        (out / "lines.txt").write_text(profile.line_timer.report())
+    return out
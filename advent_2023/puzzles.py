@@ -0,0 +1,163 @@
+"""Find the solution modules under ``days/`` and import them without running
+their ``__main__`` blocks"""
+
+import importlib.util
+import os
+import re
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from advent_2023.trace import StrippedSourceLoader
+
+DAYS_DIR = Path(__file__).resolve().parent.parent / "days"
+
+PART_FILE = re.compile(r"part(\d\w*)\.py")
+
+# Extra arguments the __main__ blocks pass to solve() along with the real input
+SOLVE_ARGS = {
+    (2, "1"): ({"red": 12, "green": 13, "blue": 14},),
+    (11, "2"): (1000000,),
+    (20, "1"): (True,),
+    (21, "1"): (64,),
+    # part 2 fits a quadratic through 65, 65 + 131 and 65 + 2 * 131 steps,
+    # the first of those is the one worth timing
+    (21, "2"): (65,),
+    (24, "1"): (200000000000000, 400000000000000, 200000000000000, 400000000000000),
+}
+
+# Functions that turn the input text into puzzle objects, the runner reports
+# time spent inside these separately from the rest of solve()
+PARSERS = {
+    2: ("Games.from_lines",),
+    3: ("parse_part_numbers",),
+    4: ("Card.from_line",),
+    5: ("Map.from_map", "PiecewiseMap.from_stanza"),
+    7: ("pack_hand",),
+    8: ("parse",),
+    10: ("Map.__init__",),
+    11: ("read_galaxy",),
+    13: ("get_patterns",),
+    14: ("parse",),
+    17: ("parse",),
+    19: ("parse_workflows", "parse_parts"),
+    20: ("parse",),
+    21: ("Puzzle.__init__",),
+    22: ("load_bricks",),
+    24: ("parse_hailstones",),
+}
+
+# Days whose solve() can take its input as one of the inputs.read_*()
+# iterators instead of the whole text, and which one. A (day, part) key is
+# for one part of a day whose other parts still need the text.
+STREAMS = {
+    1: "lines",
+    (3, "1"): "lines",
+    (3, "2_v2"): "lines",
+    4: "lines",
+    7: "lines",
+    9: "lines",
+    12: "lines",
+    15: "fields",
+    18: "lines",
+}
+
+
+@dataclass(frozen=True)
+class Puzzle:
+    day: int
+    part: str
+    path: Path
+
+    def __str__(self):
+        return f"day {self.day:02d} part {self.part}"
+
+    @property
+    def module_name(self) -> str:
+        return f"day{self.day:02d}_part{self.part}"
+
+    @property
+    def input_path(self) -> Path:
+        return self.path.parent / "input.txt"
+
+    @property
+    def solve_args(self) -> tuple:
+        return SOLVE_ARGS.get((self.day, self.part), ())
+
+    @property
+    def parsers(self) -> tuple[str, ...]:
+        return PARSERS.get(self.day, ())
+
+    @property
+    def stream(self) -> str | None:
+        return STREAMS.get((self.day, self.part), STREAMS.get(self.day))
+
+    @classmethod
+    def from_path(cls, path: Path) -> "Puzzle":
+        path = Path(path).resolve()
+        match = PART_FILE.fullmatch(path.name)
+        if match is None or not path.parent.name.isdigit():
+            raise ValueError(f"{path} doesn't look like days/NN/partP.py")
+        return cls(int(path.parent.name), match.group(1), path)
+
+
+def discover(days_dir: Path = DAYS_DIR) -> list[Puzzle]:
+    puzzles = []
+    for path in sorted(Path(days_dir).glob("[0-9][0-9]/part*.py")):
+        if PART_FILE.fullmatch(path.name):
+            puzzles.append(Puzzle.from_path(path))
+    return puzzles
+
+
+def select(
+    day: int | None = None, part: str | None = None, days_dir: Path = DAYS_DIR
+) -> list[Puzzle]:
+    found = [
+        puzzle
+        for puzzle in discover(days_dir)
+        if (day is None or puzzle.day == day) and (part is None or puzzle.part == part)
+    ]
+    if not found:
+        raise LookupError(f"no solution for day={day} part={part} in {days_dir}")
+    return found
+
+
+@contextmanager
+def working_directory(path: Path):
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def load(puzzle: Puzzle, trace: bool = False):
+    """Import a solution module from its file
+
+    Modules read their sample files relative to the current directory when
+    they're imported, so this runs from the day's directory the same way
+    ``python partP.py`` would. Unless ``trace`` is set the module's ``ic()``
+    statements are stripped out and the rest of its tracing is disabled."""
+
+    loader = (
+        None if trace else StrippedSourceLoader(puzzle.module_name, str(puzzle.path))
+    )
+    spec = importlib.util.spec_from_file_location(
+        puzzle.module_name, puzzle.path, loader=loader
+    )
+    module = importlib.util.module_from_spec(spec)
+    # registered so worker processes can unpickle functions from the module
+    sys.modules[puzzle.module_name] = module
+    try:
+        with working_directory(puzzle.path.parent):
+            spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[puzzle.module_name]
+        raise
+
+    # same as the __main__ blocks: no debug trace on real input
+    if not trace and (ic := getattr(module, "ic", None)) is not None:
+        ic.disable()
+    return module
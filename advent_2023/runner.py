@@ -0,0 +1,101 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from advent_2023 import inputs
+from advent_2023.lazy import finish_lazy_imports
+from advent_2023.puzzles import Puzzle, load
+from advent_2023.timing import PhaseTimer, Stats, format_seconds, timed_functions
+
+PHASES = ("read", "parse", "solve", "wall")
+
+
+@dataclass
+class RunResult:
+    puzzle: Puzzle
+    answer: Any = None
+    import_time: float = 0.0
+    samples: dict[str, list[float]] = field(
+        default_factory=lambda: {phase: [] for phase in PHASES}
+    )
+
+    def stats(self, phase: str) -> Stats:
+        return Stats.from_samples(self.samples[phase])
+
+    def report(self) -> str:
+        lines = [
+            f"{self.puzzle}: {self.answer}",
+            f"  import {format_seconds(self.import_time):>12}",
+            f"  {'':6} {'min':>12} {'median':>12} {'p95':>12}",
+        ]
+        for phase in PHASES:
+            stats = self.stats(phase)
+            lines.append(
+                f"  {phase:6} {format_seconds(stats.min):>12}"
+                f" {format_seconds(stats.median):>12} {format_seconds(stats.p95):>12}"
+            )
+        return "\n".join(lines)
+
+
+def read_input(puzzle: Puzzle, input_path: Path, stream: bool = False):
+    """The input text, or with ``stream`` an iterator that reads the file as
+    solve() goes, for the days that can take one"""
+
+    if stream and puzzle.stream is not None:
+        read = getattr(inputs, f"read_{puzzle.stream}")
+        return read(input_path)
+    return Path(input_path).read_text().strip()
+
+
+def time_solve(
+    module, input_path: Path, repeat: int, result: RunResult, stream: bool = False
+) -> RunResult:
+    """Add ``repeat`` timed calls of the module's solve() to ``result``
+
+    Each repeat re-reads the input, so "read" is the file I/O, "parse" is
+    the time spent in the day's parser functions (see ``PARSERS``), "solve"
+    is the rest of solve() and "wall" is all of it together. When streaming
+    the file is read inside solve(), and counted there."""
+
+    puzzle = result.puzzle
+    timer = PhaseTimer()
+    with timed_functions(module, puzzle.parsers, timer):
+        for _ in range(repeat):
+            timer.reset()
+            start = perf_counter()
+            input_data = read_input(puzzle, input_path, stream)
+            read_done = perf_counter()
+            result.answer = module.solve(input_data, *puzzle.solve_args)
+            done = perf_counter()
+
+            result.samples["read"].append(read_done - start)
+            result.samples["parse"].append(timer.elapsed)
+            result.samples["solve"].append(done - read_done - timer.elapsed)
+            result.samples["wall"].append(done - start)
+
+    return result
+
+
+def run_puzzle(
+    puzzle: Puzzle,
+    input_path: Path | None = None,
+    repeat: int = 1,
+    trace: bool = False,
+    stream: bool = False,
+) -> RunResult:
+    """Import ``puzzle`` once and time ``repeat`` calls of its solve()
+
+    ``trace`` keeps the module's ic() calls, set up ``trace.ic`` to choose
+    what they print. ``stream`` reads the input a line at a time for the
+    days in ``puzzles.STREAMS``."""
+
+    result = RunResult(puzzle)
+
+    start = perf_counter()
+    module = load(puzzle, trace)
+    # numpy and friends too, so their import isn't timed as the first solve
+    finish_lazy_imports(module)
+    result.import_time = perf_counter() - start
+
+    return time_solve(module, input_path or puzzle.input_path, repeat, result, stream)
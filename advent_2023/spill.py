@@ -0,0 +1,153 @@
+"""Sorting more ints than fit in memory
+
+``sorted_ints()`` sorts int64 values as they come in runs of ``run_size``,
+writes each sorted run to a temporary file and merges the runs back with
+``heapq.merge``, reading each file a block at a time. Only one run and a
+block per run being merged are in memory at once. Inputs that fit in a
+single run are sorted in memory and never touch the disk.
+
+Each run being merged holds a file open, so with more than ``fan_in`` runs
+they're first merged ``fan_in`` at a time into longer runs, as many passes
+as it takes."""
+
+import heapq
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import count
+from pathlib import Path
+
+from advent_2023.lazy import lazy_import
+
+np = lazy_import("numpy")
+tempfile = lazy_import("tempfile")
+
+# values per in-memory run, 32 MB of int64
+RUN_SIZE = 1 << 22
+# values read from a spilled run at a time
+BLOCK_SIZE = 1 << 16
+ITEM_SIZE = array("q").itemsize
+# most runs merged at once, well under the usual limit of 1024 open files
+FAN_IN = 64
+
+
+def _spill(run: array, path: Path) -> Path:
+    np.sort(np.frombuffer(run, dtype=np.int64)).tofile(path)
+    return path
+
+
+def _read_run(path: Path) -> Iterator[int]:
+    with open(path, "rb") as file:
+        while block := file.read(BLOCK_SIZE * ITEM_SIZE):
+            values = array("q")
+            values.frombytes(block)
+            yield from values
+
+
+def _merge_runs(paths: list[Path], path: Path) -> Path:
+    """Merge sorted run files into one new one, and delete them"""
+
+    with open(path, "wb") as file:
+        block = array("q")
+        for value in heapq.merge(*(_read_run(run) for run in paths)):
+            block.append(value)
+            if len(block) == BLOCK_SIZE:
+                block.tofile(file)
+                block = array("q")
+        block.tofile(file)
+    for run in paths:
+        run.unlink()
+    return path
+
+
+class _SpillDirectory:
+    """Paths for run files, in a temporary directory made on first use"""
+
+    def __init__(self, directory: Path | None):
+        self.directory = directory
+        self.temporary = None
+        self.names = count()
+
+    def new_path(self) -> Path:
+        if self.temporary is None:
+            self.temporary = tempfile.TemporaryDirectory(dir=self.directory)
+        return Path(self.temporary.name) / f"run{next(self.names)}"
+
+    def cleanup(self):
+        if self.temporary is not None:
+            self.temporary.cleanup()
+
+
+def sorted_ints(
+    values: Iterable[int],
+    run_size: int = RUN_SIZE,
+    directory: Path | None = None,
+    fan_in: int = FAN_IN,
+) -> Iterator[int]:
+    """``values``, which must fit in an int64, in ascending order
+
+    Spill files go in a temporary directory under ``directory`` (the
+    system default if None), made at the first spill and removed once the
+    merge is done."""
+
+    run = array("q")
+    runs = []
+    spill = _SpillDirectory(directory)
+    try:
+        for value in values:
+            run.append(value)
+            if len(run) == run_size:
+                runs.append(_spill(run, spill.new_path()))
+                run = array("q")
+
+        if not runs:
+            yield from sorted(run)
+            return
+        if run:
+            runs.append(_spill(run, spill.new_path()))
+        del run
+
+        while len(runs) > fan_in:
+            groups = [runs[i : i + fan_in] for i in range(0, len(runs), fan_in)]
+            runs = [_merge_runs(group, spill.new_path()) for group in groups]
+        yield from heapq.merge(*(_read_run(path) for path in runs))
+    finally:
+        spill.cleanup()
+
+
+# Only defined under pytest, so a plain import skips pytest
+if "pytest" in sys.modules:
+    import random
+
+    import pytest
+
+    INT64 = (-(2**63), 2**63 - 1)
+
+    @pytest.mark.parametrize("n_values", [0, 1, 3, 4, 7, 50, 200])
+    def test_sorted_ints(tmp_path, n_values) -> None:
+        # a narrow range for plenty of duplicates, plus the int64 limits
+        rng = random.Random(n_values)
+        values = [rng.randint(-20, 20) for _ in range(n_values)]
+        values += INT64[: min(n_values, 2)]
+        rng.shuffle(values)
+
+        result = sorted_ints(values, run_size=3, directory=tmp_path, fan_in=2)
+        assert list(result) == sorted(values)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_sorted_ints_spills(tmp_path) -> None:
+        values = list(range(20, 0, -1))
+        result = sorted_ints(values, run_size=3, directory=tmp_path, fan_in=2)
+        assert next(result) == 1
+        # 7 runs merged 2 at a time, down to 2 runs left to merge
+        (spill,) = tmp_path.iterdir()
+        assert len(list(spill.iterdir())) == 2
+        # stopping early still cleans up
+        result.close()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_sorted_ints_in_memory(tmp_path) -> None:
+        result = sorted_ints([3, -1, 2], run_size=4, directory=tmp_path)
+        assert next(result) == -1
+        assert list(tmp_path.iterdir()) == []
+        assert list(result) == [2, 3]
@@ -0,0 +1,136 @@
+import functools
+import inspect
+import statistics
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+
+
+@dataclass(frozen=True)
+class Stats:
+    min: float
+    median: float
+    p95: float
+
+    @classmethod
+    def from_samples(cls, samples: list[float]) -> "Stats":
+        ordered = sorted(samples)
+        # nearest-rank percentile, with 20 repeats p95 is the second slowest
+        p95 = ordered[max(0, -(-95 * len(ordered) // 100) - 1)]
+        return cls(ordered[0], statistics.median(ordered), p95)
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+class PhaseTimer:
+    """Accumulates time spent inside wrapped functions
+
+    Nested or recursive calls only count once, so wrapping both a parser and
+    a helper it calls doesn't double up."""
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self._depth = 0
+
+    def reset(self):
+        self.elapsed = 0.0
+
+    def _enter(self):
+        self._depth += 1
+        if self._depth == 1:
+            self._start = perf_counter()
+
+    def _exit(self):
+        self._depth -= 1
+        if self._depth == 0:
+            self.elapsed += perf_counter() - self._start
+
+    def wrap(self, func):
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                gen = func(*args, **kwargs)
+                while True:
+                    self._enter()
+                    try:
+                        item = next(gen)
+                    except StopIteration:
+                        return
+                    finally:
+                        self._exit()
+                    yield item
+
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self._enter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit()
+
+        return wrapper
+
+
+def _resolve(module, dotted_name: str):
+    *path, attr = dotted_name.split(".")
+    owner = module
+    for name in path:
+        owner = getattr(owner, name, None)
+        if owner is None:
+            return None, None, None
+    if isinstance(owner, type):
+        raw = owner.__dict__.get(attr)
+    else:
+        raw = getattr(owner, attr, None)
+    return owner, attr, raw
+
+
+def find_functions(module, dotted_names) -> dict:
+    """The plain functions behind ``dotted_names`` in ``module``, e.g.
+    "ScoreKeeper.solve", with classmethods and staticmethods unwrapped.
+    Names that aren't functions in the module are left out."""
+
+    found = {}
+    for dotted_name in dotted_names:
+        _, _, raw = _resolve(module, dotted_name)
+        if isinstance(raw, classmethod | staticmethod):
+            raw = raw.__func__
+        if inspect.isfunction(raw):
+            found[dotted_name] = raw
+    return found
+
+
+@contextmanager
+def timed_functions(module, dotted_names, timer: PhaseTimer):
+    """Patch ``module`` so the named functions report into ``timer``
+
+    Names that don't exist in the module are skipped, every day calls its
+    parser something a little different."""
+
+    patched = []
+    for dotted_name in dotted_names:
+        owner, attr, raw = _resolve(module, dotted_name)
+        if raw is None:
+            continue
+        if isinstance(raw, classmethod | staticmethod):
+            replacement = type(raw)(timer.wrap(raw.__func__))
+        elif callable(raw):
+            replacement = timer.wrap(raw)
+        else:
+            continue
+        setattr(owner, attr, replacement)
+        patched.append((owner, attr, raw))
+    try:
+        yield timer
+    finally:
+        for owner, attr, raw in reversed(patched):
+            setattr(owner, attr, raw)
@@ -1,15 +1,15 @@
 import sys
 from pathlib import Path
 
-import pytest
-from icecream import ic
+from advent_2023.inputs import line_ranges, lines, mapped, read_range
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
 
 def solve(input_data):
     ans = 0
-    for line in input_data.split("\n"):
+    for line in lines(input_data):
         if not line:
             continue
         digs = [ch for ch in line if ch.isdigit()]
@@ -19,30 +19,55 @@ def solve(input_data):
     return ans
 
 
+def solve_range(path: Path, start: int, end: int) -> int:
+    return solve(read_range(path, start, end))
+
+
+def solve_file(path: Path, workers: int | None = None) -> int:
+    """solve() for a calibration file of any size, on every core
+
+    The mapped file is cut at newlines into line_ranges(), each worker
+    process sums the lines of the ranges it's handed, and the partial sums
+    are added up here."""
+
+    # imported here, it takes longer than the rest of the module put together
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    with mapped(path) as data:
+        ranges = line_ranges(data)
+    with ProcessPoolExecutor(workers) as pool:
+        partials = [pool.submit(solve_range, path, start, end) for start, end in ranges]
+        return sum(partial.result() for partial in partials)
+
+
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-EXAMPLES = [
-    (
-        """1abc2
+    EXAMPLES = [
+        (
+            """1abc2
 pqr3stu8vwx
 a1b2c3d4e5f
 treb7uchet""",
-        142,
-    ),
-]
+            142,
+        ),
+    ]
 
-
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES)
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES)
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
@@ -54,6 +79,5 @@ if __name__ == "__main__":
 
     #  Actual input data generally has more iterations, turn off log
     ic.disable()
-    my_input = Path("input.txt").read_text()
-    result = solve(my_input)
+    result = solve_file(Path("input.txt"))
     print(result)
@@ -1,66 +1,132 @@
 import sys
 from pathlib import Path
 
-import pytest
-from icecream import ic
+from advent_2023.inputs import line_ranges, lines, mapped, read_range
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
-
-def get_digits(line: str):
-    words = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
-    numbers = ["1", "2", "3", "4", "5", "6", "7", "8", "9"]
-
-    for idx in range(len(line)):
-        if line[idx].isdigit():
-            yield line[idx]
-        else:
-            rest = line[idx:]
-            for w, n in zip(words, numbers):
-                if rest.startswith(w):
-                    yield n
-                    break
+WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+DIGITS = {word: str(n) for n, word in enumerate(WORDS, start=1)}
+DIGITS.update({str(n): str(n) for n in range(1, 10)})
+
+
+def build_automaton(patterns: dict[str, str]) -> tuple[list[dict], list]:
+    """An Aho-Corasick automaton finding any of ``patterns`` in a string
+
+    Returns ``goto``, for each state the next state after each character
+    (anything missing goes back to state 0), and ``found``, the value of
+    the pattern a state completes or None. The failure links are folded
+    into ``goto`` so each character is one dict lookup."""
+
+    goto = [{}]
+    found = [None]
+    for pattern, value in patterns.items():
+        state = 0
+        for ch in pattern:
+            if ch not in goto[state]:
+                goto.append({})
+                found.append(None)
+                goto[state][ch] = len(goto) - 1
+            state = goto[state][ch]
+        found[state] = value
+
+    # breadth first, so a state's failure state is complete before it
+    fail = [0] * len(goto)
+    queue = list(goto[0].values())
+    for state in queue:
+        for ch, child in goto[state].items():
+            fail[child] = goto[fail[state]].get(ch, 0)
+            if found[child] is None:
+                found[child] = found[fail[child]]
+            queue.append(child)
+        for ch, next_state in goto[fail[state]].items():
+            goto[state].setdefault(ch, next_state)
+    return goto, found
+
+
+FORWARD = build_automaton(DIGITS)
+# the last digit of a line is the first one in the line reversed
+BACKWARD = build_automaton({word[::-1]: value for word, value in DIGITS.items()})
+
+
+def get_digits(line, automaton=FORWARD):
+    """Every digit or digit word in ``line``, overlaps included: "eightwo"
+    gives 8 then 2"""
+
+    goto, found = automaton
+    state = 0
+    for ch in line:
+        state = goto[state].get(ch, 0)
+        if found[state] is not None:
+            yield found[state]
 
 
 def solve(input_data):
     ans = 0
-    for line in input_data.split("\n"):
+    for line in lines(input_data):
         if not line:
             continue
-        digs = list(get_digits(line))
-        score = int("".join([digs[0], digs[-1]]))
+        first = next(get_digits(line))
+        last = next(get_digits(reversed(line), BACKWARD))
+        score = int(first + last)
         ic(line, score)
         ans += score
     return ans
 
 
+def solve_range(path: Path, start: int, end: int) -> int:
+    return solve(read_range(path, start, end))
+
+
+def solve_file(path: Path, workers: int | None = None) -> int:
+    """solve() for a calibration file of any size, on every core
+
+    The mapped file is cut at newlines into line_ranges(), each worker
+    process sums the lines of the ranges it's handed, and the partial sums
+    are added up here."""
+
+    # imported here, it takes longer than the rest of the module put together
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    with mapped(path) as data:
+        ranges = line_ranges(data)
+    with ProcessPoolExecutor(workers) as pool:
+        partials = [pool.submit(solve_range, path, start, end) for start, end in ranges]
+        return sum(partial.result() for partial in partials)
+
+
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-EXAMPLES = [
-    (
-        """two1nine
+    EXAMPLES = [
+        (
+            """two1nine
 eightwothree
 abcone2threexyz
 xtwone3four
 4nineeightseven2
 zoneight234
 7pqrstsixteen""",
-        281,
-    )
-]
+            281,
+        )
+    ]
 
-
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES)
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES)
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
@@ -72,6 +138,5 @@ if __name__ == "__main__":
 
     #  Actual input data generally has more iterations, turn off log
     ic.disable()
-    my_input = Path("input.txt").read_text()
-    result = solve(my_input)
+    result = solve_file(Path("input.txt"))
     print(result)
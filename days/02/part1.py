@@ -1,70 +1,116 @@
 import sys
-from collections import defaultdict
 from pathlib import Path
 
-import parse as p
-import pytest
-from icecream import ic
+from advent_2023.inputs import lines
+from advent_2023.lazy import lazy_import
+from advent_2023.parsing import LinePattern
+from advent_2023.trace import ic
 
-# --> Puzzle solution
-
-
-class Game:
-    def __init__(self, line):
-        self.game_id, rest_of_line = p.parse("Game {:d}: {}", line)
+np = lazy_import("numpy")
 
-        self.trials = []
-        for trial in rest_of_line.split(";"):
-            cubes = trial.split(",")
-            cube_counts = defaultdict(int)
-            for cube in cubes:
-                count, color = p.parse("{:d} {}", cube)
-                cube_counts[color] = count
-            self.trials.append(cube_counts)
-
-    def possible(self, cube_counts):
-        for color, count in cube_counts.items():
-            for game in self.trials:
-                if game[color] > count:
-                    ic("impossible", cube_counts, game)
-                    return False
+# --> Puzzle solution
 
-        ic("possible", cube_counts, self.trials)
-        return True
+GAME = LinePattern("Game {:d}: {}")
+CUBE = LinePattern("{:d} {}")
+COLORS = ("red", "green", "blue")
+COLUMN = {color: column for column, color in enumerate(COLORS)}
+# most booleans Games.feasible_sums() compares at once, 4 MB
+COMPARE_CELLS = 1 << 22
+
+
+class Games:
+    """Every game as numpy columns, one parse for any number of questions
+
+    ``draws`` has a row of red, green and blue counts per handful drawn,
+    ``draw_game`` the index of the game each draw is from, and ``maxima``
+    the most of each color any draw of a game showed."""
+
+    def __init__(self, ids: list[int], draws: list[list[int]], draw_game: list[int]):
+        self.ids = np.array(ids, dtype=np.int64)
+        self.draws = np.array(draws, dtype=np.int64).reshape(-1, len(COLORS))
+        self.draw_game = np.array(draw_game, dtype=np.int64)
+        self.maxima = np.zeros((len(self.ids), len(COLORS)), dtype=np.int64)
+        if len(self.draws):
+            # a game's draws are next to each other, in game order
+            starts = np.searchsorted(self.draw_game, np.arange(len(self.ids)))
+            self.maxima = np.maximum.reduceat(self.draws, starts)
+
+    @classmethod
+    def from_lines(cls, game_lines):
+        ids, draws, draw_game = [], [], []
+        for line in game_lines:
+            if not line:
+                continue
+            game_id, rest_of_line = GAME.parse(line)
+            for trial in rest_of_line.split(";"):
+                counts = [0] * len(COLORS)
+                for cube in trial.split(","):
+                    count, color = CUBE.parse(cube.strip())
+                    counts[COLUMN[color]] = count
+                draws.append(counts)
+                draw_game.append(len(ids))
+            ids.append(game_id)
+        return cls(ids, draws, draw_game)
+
+    def feasible_sums(self, bags) -> "np.ndarray":
+        """For each bag, a row of red, green and blue counts, the sum of the
+        ids of the games that could have been played with it
+
+        Bags go through in blocks, so the bags by games by colors
+        comparison never holds more than COMPARE_CELLS booleans."""
+
+        bags = np.asarray(bags, dtype=np.int64).reshape(-1, len(COLORS))
+        sums = np.zeros(len(bags), dtype=np.int64)
+        block = max(1, COMPARE_CELLS // max(1, self.maxima.size))
+        for start in range(0, len(bags), block):
+            chunk = bags[start : start + block, np.newaxis]
+            possible = (self.maxima[np.newaxis] <= chunk).all(axis=2)
+            ic(chunk, possible)
+            sums[start : start + block] = possible.astype(np.int64) @ self.ids
+        return sums
 
 
 def solve(input_data, check_vs):
-    score = 0
-    for line in input_data.split("\n"):
-        if line:
-            game = Game(line)
-            if game.possible(check_vs):
-                score += game.game_id
-
-    return score
+    bag = [check_vs[color] for color in COLORS]
+    return int(Games.from_lines(lines(input_data)).feasible_sums([bag])[0])
 
 
 # --> Test driven development helpers
 
+# the bag the elf asks about, used by the tests and the real input
+cubeset = {"red": 12, "green": 13, "blue": 14}
 
-# Test any examples given in the problem
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-test_data = Path("input-sample.txt").read_text().strip()
-cubeset = {"red": 12, "green": 13, "blue": 14}
+    # Test any examples given in the problem
+
+    test_data = Path("input-sample.txt").read_text().strip()
 
-EXAMPLES = [
-    (test_data, cubeset, 8),
-]
+    EXAMPLES = [
+        (test_data, cubeset, 8),
+    ]
 
+    @pytest.mark.parametrize("sample_data, cubeset, sample_solution", EXAMPLES)
+    def test_samples(sample_data, cubeset, sample_solution) -> None:
+        assert solve(sample_data, cubeset) == sample_solution
 
-@pytest.mark.parametrize("sample_data, cubeset, sample_solution", EXAMPLES)
-def test_samples(sample_data, cubeset, sample_solution) -> None:
-    assert solve(sample_data, cubeset) == sample_solution
+    def test_feasible_sums() -> None:
+        games = Games.from_lines(lines(test_data))
+        bags = [[12, 13, 14], [0, 0, 0], [20, 20, 20]]
+        assert games.feasible_sums(bags).tolist() == [8, 0, 15]
+
+    def test_bag_missing_color() -> None:
+        with pytest.raises(KeyError):
+            solve(test_data, {"red": 12, "green": 13})
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
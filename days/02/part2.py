@@ -1,67 +1,90 @@
 import sys
-from collections import defaultdict
 from pathlib import Path
 
-import pytest
-from icecream import ic
-
-# --> Puzzle solution
+from advent_2023.inputs import lines
+from advent_2023.lazy import lazy_import
+from advent_2023.parsing import LinePattern
+from advent_2023.trace import ic
 
+np = lazy_import("numpy")
 
-class Game:
-    def __init__(self, line):
-        game, games = line.split(":")
-
-        self.game_id = int(game.split()[-1])
-        self.games = []
-        for game in games.split(";"):
-            cubes = game.split(",")
-            game_numbers = {}
-            for cube in cubes:
-                count, color = cube.split()
-                game_numbers[color] = int(count)
-            self.games.append(game_numbers)
+# --> Puzzle solution
 
-    def score(self):
-        acc = defaultdict(int)
-        for game in self.games:
-            for color, value in game.items():
-                acc[color] = max(value, acc[color])
-        pscore = 1
-        for value in acc.values():
-            pscore *= value
-        return pscore
+GAME = LinePattern("Game {:d}: {}")
+CUBE = LinePattern("{:d} {}")
+COLORS = ("red", "green", "blue")
+COLUMN = {color: column for column, color in enumerate(COLORS)}
+
+
+class Games:
+    """Every game as numpy columns, one parse for any number of questions
+
+    ``draws`` has a row of red, green and blue counts per handful drawn,
+    ``draw_game`` the index of the game each draw is from, and ``maxima``
+    the most of each color any draw of a game showed."""
+
+    def __init__(self, ids: list[int], draws: list[list[int]], draw_game: list[int]):
+        self.ids = np.array(ids, dtype=np.int64)
+        self.draws = np.array(draws, dtype=np.int64).reshape(-1, len(COLORS))
+        self.draw_game = np.array(draw_game, dtype=np.int64)
+        self.maxima = np.zeros((len(self.ids), len(COLORS)), dtype=np.int64)
+        if len(self.draws):
+            # a game's draws are next to each other, in game order
+            starts = np.searchsorted(self.draw_game, np.arange(len(self.ids)))
+            self.maxima = np.maximum.reduceat(self.draws, starts)
+
+    @classmethod
+    def from_lines(cls, game_lines):
+        ids, draws, draw_game = [], [], []
+        for line in game_lines:
+            if not line:
+                continue
+            game_id, rest_of_line = GAME.parse(line)
+            for trial in rest_of_line.split(";"):
+                counts = [0] * len(COLORS)
+                for cube in trial.split(","):
+                    count, color = CUBE.parse(cube.strip())
+                    counts[COLUMN[color]] = count
+                draws.append(counts)
+                draw_game.append(len(ids))
+            ids.append(game_id)
+        return cls(ids, draws, draw_game)
+
+    def scores(self) -> "np.ndarray":
+        """The power of each game, its fewest cubes of each color multiplied"""
+
+        # colors a game never showed are left out, rather than zeroing it
+        return np.where(self.maxima > 0, self.maxima, 1).prod(axis=1)
 
 
 def solve(input_data):
-    score = 0
-    for line in input_data.split("\n"):
-        if line:
-            score += Game(line).score()
-
-    return score
+    return int(Games.from_lines(lines(input_data)).scores().sum())
 
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
-
-test_data = Path("input-sample.txt").read_text().strip()
+    # Test any examples given in the problem
 
-EXAMPLES = [
-    (test_data, 2286),
-]
+    test_data = Path("input-sample.txt").read_text().strip()
 
+    EXAMPLES = [
+        (test_data, 2286),
+    ]
 
-@pytest.mark.parametrize("sample_data, sample_solution", EXAMPLES)
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data, sample_solution", EXAMPLES)
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
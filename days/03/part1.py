@@ -1,11 +1,11 @@
 import re
 import sys
-from collections import defaultdict
 from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
 
-import pytest
-from icecream import ic
+from advent_2023.inputs import lines
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
@@ -16,10 +16,6 @@ class PartNumber:
     row: int
     column_start: int
     column_stop: int
-    counted: bool = False
-
-    def id_(self):
-        return (self.number, self.row, self.column_start)
 
 
 def parse_part_numbers(line: str, row: int):
@@ -42,69 +38,56 @@ def parse_symbol_locations(line: str):
             yield i
 
 
-def solve(data):
-    rows = data.split("\n")
-
-    parts = defaultdict(list)
-    for i, line in enumerate(data.split("\n")):
-        parts[i] = parse_part_numbers(line, i)
-        ic(rows[i], parts[i])
-
-    triggers = defaultdict(set)
-    for row, line in enumerate(data.split("\n")):
-        locations = list(parse_symbol_locations(line))
-        for location in locations:
-            triggers[row].add(location - 1)
-            triggers[row].add(location + 1)
-
-            triggers[row - 1].add(location - 1)
-            triggers[row - 1].add(location)
-            triggers[row - 1].add(location + 1)
+def part_numbers(rows):
+    """The part numbers of a schematic read a line at a time
 
-            triggers[row + 1].add(location - 1)
-            triggers[row + 1].add(location)
-            triggers[row + 1].add(location + 1)
+    A number can only touch symbols in its own row and the rows either
+    side, so it's settled as soon as the line after it is read, and only
+    three rows are held at once. A blank line after the last row flushes
+    that row's numbers out."""
 
-    parts_that_count = set()
-    for row, locations in triggers.items():
-        ic(row, triggers)
-        for location in locations:
-            for part in parts[row]:
-                if part.column_start <= location <= part.column_stop:
-                    part.counted = True
-                    parts_that_count.add(part.id_())
+    above = set()
+    middle = set()
+    middle_parts = []
+    for row, line in enumerate(chain(rows, [""])):
+        below = set(parse_symbol_locations(line))
+        near = above | middle | below
+        for part in middle_parts:
+            if not near.isdisjoint(range(part.column_start - 1, part.column_stop + 2)):
+                yield part
+            else:
+                ic(part)
+        above, middle = middle, below
+        middle_parts = parse_part_numbers(line, row)
 
-    score = 0
-    for item in parts_that_count:
-        score += item[0]
 
-    for row, partlist in parts.items():
-        for p in partlist:
-            if not p.counted:
-                ic(p)
-
-    return score
+def solve(data):
+    return sum(part.number for part in part_numbers(lines(data)))
 
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample, 4361),
-]
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample, 4361),
+    ]
 
-
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
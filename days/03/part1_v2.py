@@ -0,0 +1,107 @@
+import sys
+from pathlib import Path
+
+from advent_2023.lazy import lazy_import
+from advent_2023.trace import ic
+
+np = lazy_import("numpy")
+
+# --> Puzzle solution
+
+NEWLINE, DOT, ZERO, NINE = b"\n.09"
+
+
+def load_schematic(data: str):
+    """The schematic as a uint8 array of character codes, one row per line
+
+    Each row keeps its newline as a last column, so a run of digits never
+    carries on into the next row."""
+
+    raw = np.frombuffer((data.strip("\n") + "\n").encode(), dtype=np.uint8)
+    width = int(np.argmax(raw == NEWLINE)) + 1
+    return raw.reshape(-1, width)
+
+
+def dilate(mask):
+    """True wherever ``mask`` or any of the 8 cells around it is"""
+
+    rows, columns = mask.shape
+    padded = np.pad(mask, 1)
+    around = np.zeros_like(mask)
+    for row in range(3):
+        for column in range(3):
+            around |= padded[row : row + rows, column : column + columns]
+    return around
+
+
+def digit_runs(digits):
+    """The flat indices of the digit cells, and the index into those where
+    each run of digits, one part number, starts"""
+
+    cells = np.flatnonzero(digits)
+    starts = np.flatnonzero(np.diff(cells, prepend=-2) != 1)
+    return cells, starts
+
+
+def run_values(schematic, cells, starts):
+    """The number each run of digits spells"""
+
+    digits = schematic.ravel()[cells].astype(np.int64) - ZERO
+    ends = np.append(starts[1:], len(cells))
+    run = np.repeat(np.arange(len(starts)), ends - starts)
+    place = ends[run] - 1 - np.arange(len(cells))
+    return np.add.reduceat(digits * 10**place, starts)
+
+
+def solve(data):
+    schematic = load_schematic(data)
+    digits = (schematic >= ZERO) & (schematic <= NINE)
+    symbols = ~digits & (schematic != DOT) & (schematic != NEWLINE)
+    near_symbol = dilate(symbols)
+
+    cells, starts = digit_runs(digits)
+    if not len(cells):
+        return 0
+    numbers = run_values(schematic, cells, starts)
+    counted = np.logical_or.reduceat(near_symbol.ravel()[cells], starts)
+    ic(numbers, counted)
+    return int(numbers[counted].sum())
+
+
+# --> Test driven development helpers
+
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
+
+    # Test any examples given in the problem
+
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample, 4361),
+    ]
+
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
+
+
+# --> Setup and run
+
+if __name__ == "__main__":
+    import pytest
+
+    #  Run the test examples with icecream debug-trace turned on
+    ic.enable()
+    ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
+    if ex not in {pytest.ExitCode.OK, pytest.ExitCode.NO_TESTS_COLLECTED}:
+        print(f"tests FAILED ({ex})")
+        sys.exit(1)
+    else:
+        print("tests PASSED")
+
+    #  Actual input data generally has more iterations, turn off log
+    ic.disable()
+    my_input = Path("input.txt").read_text().strip()
+    result = solve(my_input)
+    print(result)
@@ -4,8 +4,7 @@ from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
 
-import pytest
-from icecream import ic
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
@@ -54,18 +53,21 @@ def parse_symbol_locations(line: str, row: int):
 def solve(data):
     score = 0
 
-    parts = defaultdict(list)
+    # row -> column -> the part number covering that cell
+    covering = defaultdict(dict)
     for i, line in enumerate(data.split("\n")):
-        parts[i] = parse_part_numbers(line, i)
+        for part in parse_part_numbers(line, i):
+            for column in range(part.column_start, part.column_stop + 1):
+                covering[i][column] = part
 
     for row, line in enumerate(data.split("\n")):
         locations = list(parse_symbol_locations(line, row))
         for location in locations:
             for check_row in range(row - 1, row + 2):
                 for check_column in range(location.column - 1, location.column + 2):
-                    for part in parts[check_row]:
-                        if part.column_start <= check_column <= part.column_stop:
-                            location.trigger(part)
+                    part = covering[check_row].get(check_column)
+                    if part is not None:
+                        location.trigger(part)
 
             if len(location.triggers) == 2:
                 ic(location.row, location.column, location.triggers)
@@ -77,23 +79,27 @@ def solve(data):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample, 467835),
-]
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample, 467835),
+    ]
 
-
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
@@ -1,10 +1,12 @@
 import re
 import sys
+from collections import deque
 from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
 
-import pytest
-from icecream import ic
+from advent_2023.inputs import lines
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
@@ -16,14 +18,6 @@ class PartNumber:
     column_start: int
     column_stop: int
 
-    def touches(self, row: int, column: int) -> bool:
-        return all(
-            (
-                self.row - 1 <= row <= self.row + 1,
-                self.column_start - 1 <= column <= self.column_stop + 1,
-            )
-        )
-
 
 def parse_part_numbers(line: str, row: int):
     for match in re.finditer(r"\d+", line):
@@ -41,46 +35,75 @@ def parse_symbol_locations(line: str, row: int):
             yield (row, i)
 
 
-def solve(data):
-    score = 0
+def index_row(parts) -> dict[int, PartNumber]:
+    """Which part number covers each column of one row"""
 
-    symbols = []
-    parts = []
+    return {
+        column: part
+        for part in parts
+        for column in range(part.column_start, part.column_stop + 1)
+    }
 
-    for row, line in enumerate(data.splitlines()):
-        symbols.extend(list(parse_symbol_locations(line, row)))
-        parts.extend(list(parse_part_numbers(line, row)))
 
-    for symbol in symbols:
-        touch_parts = []
-        for part in parts:
-            if part.touches(*symbol):
-                touch_parts.append(part)
-        if len(touch_parts) == 2:
-            p1, p2 = touch_parts
-            score += p1.number * p2.number
-    return score
+def touching(covering: list[dict[int, PartNumber]], column: int) -> list[PartNumber]:
+    """The part numbers next to ``column`` in the rows indexed by ``covering``,
+    the row above a symbol, its own row and the row below"""
 
+    found = {}
+    for row in covering:
+        for check_column in range(column - 1, column + 2):
+            part = row.get(check_column)
+            if part is not None:
+                found[part.row, part.column_start] = part
+    return list(found.values())
 
-# --> Test driven development helpers
 
+def gear_ratios(rows):
+    """The ratio of each gear in a schematic read a line at a time
 
-# Test any examples given in the problem
+    A gear's row is settled once the line after it is read, so only the
+    index of three rows is held at once: the row above, the gears' own row
+    and the row below. A blank line after the last row flushes its gears."""
 
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample, 467835),
-]
+    covering = deque([{}, {}], maxlen=3)
+    gears = []
+    for row, line in enumerate(chain(rows, [""])):
+        covering.append(index_row(parse_part_numbers(line, row)))
+        for _, column in gears:
+            touch_parts = touching(covering, column)
+            if len(touch_parts) == 2:
+                p1, p2 = touch_parts
+                yield p1.number * p2.number
+        gears = list(parse_symbol_locations(line, row))
 
 
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+def solve(data):
+    return sum(gear_ratios(lines(data)))
+
+
+# --> Test driven development helpers
+
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
+
+    # Test any examples given in the problem
+
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample, 467835),
+    ]
+
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
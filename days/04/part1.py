@@ -1,18 +1,26 @@
 import sys
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from pathlib import Path
 
-import pytest
-from icecream import ic
+from advent_2023.inputs import lines
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
 
+def bitmask(numbers: str) -> int:
+    mask = 0
+    for number in numbers.split():
+        mask |= 1 << int(number)
+    return mask
+
+
 @dataclass
 class Card:
     id_: int
-    numbers: set[int] = field(default_factory=set)
-    winning_numbers: set[int] = field(default_factory=set)
+    # bit n is set for each number n on the card
+    numbers: int = 0
+    winning_numbers: int = 0
 
     @classmethod
     def from_line(cls, line: str):
@@ -20,8 +28,8 @@ class Card:
 
         my_card, winning_card = cards.split("|")
         id_ = int(card_id.split()[1])
-        numbers = {int(i) for i in my_card.split()}
-        winning_numbers = {int(i) for i in winning_card.split()}
+        numbers = bitmask(my_card)
+        winning_numbers = bitmask(winning_card)
         card = cls(id_, numbers, winning_numbers)
 
         ic(card.id_, card.score)
@@ -30,34 +38,37 @@ class Card:
 
     @property
     def score(self):
-        overlap = len(self.numbers.intersection(self.winning_numbers))
+        overlap = (self.numbers & self.winning_numbers).bit_count()
         if overlap:
             return 2 ** (overlap - 1)
         return 0
 
 
 def solve(input_data):
-    cards = [Card.from_line(line) for line in input_data.splitlines()]
-    return sum(c.score for c in cards)
+    return sum(Card.from_line(line).score for line in lines(input_data))
 
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [(sample, 13)]
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [(sample, 13)]
 
-
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
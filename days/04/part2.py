@@ -1,19 +1,27 @@
 import sys
-from dataclasses import dataclass, field
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
 
-import pytest
-from icecream import ic
+from advent_2023.inputs import lines
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
 
+def bitmask(numbers: str) -> int:
+    mask = 0
+    for number in numbers.split():
+        mask |= 1 << int(number)
+    return mask
+
+
 @dataclass
 class Card:
     id_: int
-    numbers: set[int] = field(default_factory=set)
-    winning_numbers: set[int] = field(default_factory=set)
-    n_copies = 1
+    # bit n is set for each number n on the card
+    numbers: int = 0
+    winning_numbers: int = 0
 
     @classmethod
     def from_line(cls, line: str):
@@ -21,46 +29,62 @@ class Card:
 
         my_card, winning_card = cards.split("|")
         id_ = int(card_id.split()[1])
-        numbers = {int(i) for i in my_card.split()}
-        winning_numbers = {int(i) for i in winning_card.split()}
+        numbers = bitmask(my_card)
+        winning_numbers = bitmask(winning_card)
         return cls(id_, numbers, winning_numbers)
 
     @property
     def n_matches(self):
-        return len(self.numbers.intersection(self.winning_numbers))
+        return (self.numbers & self.winning_numbers).bit_count()
 
 
 def solve(input_data):
-    cards = [Card.from_line(line) for line in input_data.splitlines()]
-
-    for i, card in enumerate(cards):
-        remaining_list = cards[i + 1 :]
-        for j in range(cards[i].n_matches):
-            remaining_list[j].n_copies += card.n_copies
-
-    for c in cards:
-        ic(c.id_, c.n_copies)
-
-    return sum(c.n_copies for c in cards)
+    # a difference array over the cards ahead: a card with m matches adds
+    # its copies from the next card on and takes them off again after the
+    # m-th, so each card costs the same however many it wins. It only
+    # reaches as far ahead as a card can, the input is read one at a time.
+    changes = deque()
+    won = 0
+    total = 0
+
+    for line in lines(input_data):
+        card = Card.from_line(line)
+        won += changes.popleft() if changes else 0
+        n_copies = 1 + won
+        ic(card.id_, n_copies)
+        total += n_copies
+
+        n_matches = card.n_matches
+        if n_matches:
+            while len(changes) <= n_matches:
+                changes.append(0)
+            changes[0] += n_copies
+            changes[n_matches] -= n_copies
+
+    return total
 
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
-
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [(sample, 30)]
+    # Test any examples given in the problem
 
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [(sample, 30)]
 
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
@@ -3,12 +3,16 @@ from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
 
-import parse as p
-import pytest
-from icecream import ic
+from advent_2023.lazy import lazy_import
+from advent_2023.parsing import LinePattern, int_rows, ints
+from advent_2023.trace import ic
+
+np = lazy_import("numpy")
 
 # --> Puzzle solution
 
+MAP_HEADER = LinePattern("{}-to-{} map:")
+
 
 @dataclass
 class Map:
@@ -18,36 +22,58 @@ class Map:
     source_range_start: int
     range_length: int
 
-    def get_dest(self, source):
-        if source < self.source_range_start:
-            return None
-        if source >= self.source_range_start + self.range_length:
-            return None
-        return self.dest_range_start + (source - self.source_range_start)
-
     @classmethod
     def from_map(cls, stanza: str):
         lines = stanza.splitlines()
-        source, dest = p.parse("{}-to-{} map:", lines[0])
-        for line in lines[1:]:
-            dest_range_start, source_range_start, range_length = p.parse(
-                "{:d} {:d} {:d}", line
-            )
+        source, dest = MAP_HEADER.parse(lines[0])
+        ranges = int_rows("\n".join(lines[1:]), 3).tolist()
+        for dest_range_start, source_range_start, range_length in ranges:
             m = cls(source, dest, dest_range_start, source_range_start, range_length)
             yield m
 
 
-def calc_dest(source, maps):
-    for m in maps:
-        d = m.get_dest(source)
-        if d is not None:
-            return d
-    return source
+@dataclass
+class Stage:
+    """One map's ranges as arrays sorted by source start, to map a whole
+    array of numbers at once"""
+
+    starts: "np.ndarray"
+    stops: "np.ndarray"
+    offsets: "np.ndarray"
+
+    @classmethod
+    def from_maps(cls, maps: list[Map]):
+        maps = sorted(maps, key=lambda m: m.source_range_start)
+        starts = [m.source_range_start for m in maps]
+        stops = [m.source_range_start + m.range_length for m in maps]
+        offsets = [m.dest_range_start - m.source_range_start for m in maps]
+        return cls(
+            np.array(starts, dtype=np.int64),
+            np.array(stops, dtype=np.int64),
+            np.array(offsets, dtype=np.int64),
+        )
+
+    def __call__(self, values: "np.ndarray") -> "np.ndarray":
+        if not len(self.starts):
+            return values
+        # the last range starting at or before each value, if it reaches it
+        i = np.searchsorted(self.starts, values, side="right") - 1
+        inside = (i >= 0) & (values < self.stops[i])
+        return np.where(inside, values + self.offsets[i], values)
+
+
+def map_seeds(seeds, stages: list[Stage]) -> "np.ndarray":
+    """Every seed's number after going through each stage in turn"""
+
+    values = np.asarray(seeds, dtype=np.int64)
+    for stage in stages:
+        values = stage(values)
+    return values
 
 
 def solve(input_data):
     stanzas = input_data.split("\n\n")
-    seeds = [int(s) for s in stanzas[0].split()[1:]]
+    seeds = ints(stanzas[0])
     ic(seeds)
 
     sources = defaultdict(list)
@@ -55,7 +81,6 @@ def solve(input_data):
         for m in Map.from_map(stanza):
             sources[m.source].append(m)
 
-    acc = {}
     chain = [
         "seed",
         "soil",
@@ -64,37 +89,33 @@ def solve(input_data):
         "light",
         "temperature",
         "humidity",
-        "location",
     ]
-    for seed in seeds:
-        next_source = seed
-        debug = {}
-        for ch in chain:
-            debug[ch] = next_source
-            next_source = calc_dest(next_source, sources[ch])
-        ic(debug)
-        acc[seed] = next_source
-
-    return min(acc.values())
+    locations = map_seeds(seeds, [Stage.from_maps(sources[ch]) for ch in chain])
+    ic(locations)
+    return int(locations.min())
 
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [(sample, 35)]
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [(sample, 35)]
 
-
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
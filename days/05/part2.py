@@ -1,164 +1,209 @@
 import sys
+from bisect import bisect_right
 from dataclasses import dataclass
-from itertools import pairwise
 from pathlib import Path
 
-import parse as p
-import pytest
-from icecream import ic
-
+from advent_2023.parsing import LinePattern, int_rows, ints
+from advent_2023.trace import ic
 
 # --> Puzzle solution
-class Interval:
+
+MAP_HEADER = LinePattern("{}-to-{} map:")
+
+
+class IntervalSet:
+    """An immutable set of numbers, as sorted half-open ``(start, stop)``
+    ranges
+
+    Ranges that overlap or touch are merged as the set is built, so the same
+    numbers always give the same ranges and mapping a set through the
+    almanac can't leave it in more pieces than the numbers need."""
+
+    __slots__ = ("ranges",)
+
+    def __init__(self, ranges=()):
+        merged = []
+        for start, stop in sorted(ranges):
+            if start >= stop:
+                continue
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+            else:
+                merged.append((start, stop))
+        object.__setattr__(self, "ranges", tuple(merged))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
     def __repr__(self):
-        if self.offset is not None:
-            return f"Interval(start={self.start},stop={self.stop},length={self.length},offset={self.offset})"
-        return f"Interval(start={self.start},stop={self.stop},length={self.length})"
-
-    def __init__(
-        self,
-        start: int,
-        stop: int | None,
-        length: int | None,
-        offset: int | None = None,
-    ):
-        self.start = start
-        self.stop = stop
-        self.length = length
-        self.offset = offset
-
-        if self.stop is None:
-            assert self.length is not None
-            self.stop = self.start + self.length - 1
-        if self.length is None:
-            assert self.stop is not None
-            self.length = self.stop - self.start + 1
-
-    def contains(self, val: int):
-        return self.start <= val <= self.stop
-
-    def overlap(self, other):
-        assert self.contains(other.start)
-
-        if self.contains(other.stop):
-            return other, None
-
-        assert other.stop > self.stop
-
-        return (
-            Interval(start=other.start, stop=self.stop, length=None),
-            Interval(start=self.stop + 1, stop=other.stop, length=None),
+        return f"IntervalSet({list(self.ranges)})"
+
+    def __eq__(self, other):
+        return isinstance(other, IntervalSet) and self.ranges == other.ranges
+
+    def __hash__(self):
+        return hash(self.ranges)
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def __iter__(self):
+        return iter(self.ranges)
+
+    @classmethod
+    def from_lengths(cls, numbers: list[int]):
+        """From the seeds line's start, length, start, length, ..."""
+
+        return cls(
+            (start, start + length)
+            for start, length in zip(numbers[::2], numbers[1::2])
         )
 
+    def map_through(self, piecewise: "PiecewiseMap") -> "IntervalSet":
+        """Where every number in the set goes, each range split where it
+        crosses from one piece of the map into the next"""
 
-@dataclass
-class FancyMap:
-    source: str
-    dest: str
-    offsets: dict[tuple[int, int], Interval]
+        return IntervalSet(
+            (start + offset, stop + offset)
+            for range_start, range_stop in self.ranges
+            for start, stop, offset in piecewise.cut(range_start, range_stop)
+        )
 
-    def get_dest_ranges(self, source_interval):
-        # we need to do the tuples in order now
 
-        keys = sorted(self.offsets.keys())
-        for key in keys:
-            if key[0] <= source_interval.start <= key[1]:
-                i = self.offsets[key]
-                matched, source_interval = i.overlap(source_interval)
+@dataclass(frozen=True)
+class PiecewiseMap:
+    """Adds ``offsets[i]`` to every number from ``starts[i]`` up to the next
+    start, or on forever from the last one
 
-                matched.start += i.offset
-                matched.stop += i.offset
-                yield matched
+    ``starts[0]`` is 0 and the gaps between a stanza's ranges are pieces
+    with offset 0, so every number an almanac uses falls in one piece.
+    Neighbouring pieces never share an offset."""
 
-                if source_interval is not None:
-                    yield from self.get_dest_ranges(source_interval)
-                return
+    starts: tuple[int, ...] = (0,)
+    offsets: tuple[int, ...] = (0,)
+
+    @classmethod
+    def from_pieces(cls, starts, offsets):
+        """The map with these pieces, neighbours with the same offset merged"""
 
-        # fell off end is offset 0
-        yield source_interval
+        merged_starts, merged_offsets = [], []
+        for start, offset in zip(starts, offsets):
+            if not merged_offsets or offset != merged_offsets[-1]:
+                merged_starts.append(start)
+                merged_offsets.append(offset)
+        return cls(tuple(merged_starts), tuple(merged_offsets))
 
     @classmethod
     def from_stanza(cls, stanza: str):
         lines = stanza.splitlines()
-        source, dest = p.parse("{}-to-{} map:", lines[0])
-        offsets = {}
-        for line in lines[1:]:
-            dest_range_start, source_range_start, range_length = p.parse(
-                "{:d} {:d} {:d}", line
-            )
-            i = Interval(
-                source_range_start,
-                stop=None,
-                length=range_length,
-                offset=dest_range_start - source_range_start,
-            )
-            offsets[(i.start, i.stop)] = i
-
-        keys = sorted(offsets.keys())
-        offsets[(-1, keys[0][0] - 1)] = Interval(
-            start=-1, stop=keys[0][0] - 1, length=None, offset=0
-        )
-        for prev_key, next_key in pairwise(keys):
-            if prev_key[1] + 1 < next_key[0] - 1:
-                offsets[(prev_key[1] + 1, next_key[0] - 1)] = Interval(
-                    start=prev_key[1] + 1, stop=next_key[0] - 1, length=None, offset=0
-                )
+        source, dest = MAP_HEADER.parse(lines[0])
+        ranges = int_rows("\n".join(lines[1:]), 3).tolist()
+
+        starts, offsets = [], []
+        covered = 0
+        for dest_range_start, source_range_start, range_length in sorted(
+            ranges, key=lambda r: r[1]
+        ):
+            if source_range_start > covered:
+                starts.append(covered)
+                offsets.append(0)
+            starts.append(source_range_start)
+            offsets.append(dest_range_start - source_range_start)
+            covered = source_range_start + range_length
+        starts.append(covered)
+        offsets.append(0)
+
+        m = cls.from_pieces(starts, offsets)
+        ic(source, dest, m)
+        return source, dest, m
+
+    def cut(self, start: int, stop: int | None):
+        """The pieces ``[start, stop)`` crosses as (start, stop, offset),
+        clipped to it, ``None`` for no stop"""
+
+        i = bisect_right(self.starts, start) - 1
+        while stop is None or start < stop:
+            end = self.starts[i + 1] if i + 1 < len(self.starts) else None
+            if stop is not None and (end is None or end > stop):
+                end = stop
+            yield start, end, self.offsets[i]
+            if end is None:
+                return
+            start, i = end, i + 1
 
-        m = cls(source, dest, offsets)
-        ic(m)
-        return m
+    def then(self, other: "PiecewiseMap") -> "PiecewiseMap":
+        """One map doing this one and then ``other``"""
 
+        starts, offsets = [], []
+        for start, stop, offset in self.cut(0, None):
+            landed = other.cut(start + offset, None if stop is None else stop + offset)
+            for other_start, _, other_offset in landed:
+                starts.append(other_start - offset)
+                offsets.append(offset + other_offset)
+        return PiecewiseMap.from_pieces(starts, offsets)
 
-def batch2(s):
-    if not s:
-        return
-    yield s[0], s[1]
-    yield from batch2(s[2:])
+    def __call__(self, value: int) -> int:
+        return value + self.offsets[bisect_right(self.starts, value) - 1]
 
 
 def solve(input_data):
     stanzas = input_data.split("\n\n")
-    seeds = [int(s) for s in stanzas[0].split()[1:]]
+    seeds = ints(stanzas[0]).tolist()
     ic(seeds)
 
-    source_intervals = []
-    for start, length in batch2(seeds):
-        source_intervals.append(Interval(start=start, stop=None, length=length))
-
-    sources = {}
+    maps = {}
     for stanza in stanzas[1:]:
-        m = FancyMap.from_stanza(stanza)
-        sources[m.source] = m
+        source, _, m = PiecewiseMap.from_stanza(stanza)
+        maps[source] = m
 
     chain = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity"]
 
+    # composed once, then each seed range costs a bisect per piece it crosses
+    almanac = PiecewiseMap()
     for ch in chain:
-        dest_intervals: list[Interval] = []
-        for source_interval in source_intervals:
-            dest_intervals.extend(list(sources[ch].get_dest_ranges(source_interval)))
-        source_intervals = dest_intervals
+        almanac = almanac.then(maps[ch])
 
-    ic(dest_intervals)
-    return min(d.start for d in dest_intervals)
+    locations = IntervalSet.from_lengths(seeds).map_through(almanac)
+    ic(len(locations), locations)
+    start, _ = locations.ranges[0]
+    return start
 
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
+
+    # Test any examples given in the problem
 
-# Test any examples given in the problem
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [(sample, 46)]
 
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [(sample, 46)]
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
+    def test_interval_set_normalises() -> None:
+        # overlapping and touching ranges merge, empty ones are dropped
+        ranges = IntervalSet([(10, 20), (0, 5), (5, 8), (15, 25), (30, 30), (40, 35)])
+        assert ranges.ranges == ((0, 8), (10, 25))
+        assert ranges == IntervalSet([(10, 25), (0, 8)])
+        with pytest.raises(AttributeError):
+            ranges.ranges = ()
 
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    def test_interval_set_map_through() -> None:
+        # 0..9 stays, 10..19 moves up 100, 20 on moves back to meet 0..9
+        piecewise = PiecewiseMap((0, 10, 20), (0, 100, -10))
+        mapped = IntervalSet([(5, 25)]).map_through(piecewise)
+        assert mapped.ranges == ((5, 15), (110, 120))
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
@@ -1,21 +1,55 @@
 import sys
+from math import isqrt, prod
 from pathlib import Path
 
-import pytest
-from icecream import ic
+from advent_2023.lazy import lazy_import
+from advent_2023.trace import ic
+
+np = lazy_import("numpy")
 
 
 # --> Puzzle solution
-def solve_one_race(time, distance):
-    # split time into hold_time, race_time
-    wins = 0
-    for i in range(time):
-        hold_time = i
-        race_time = time - i
-        trial = hold_time * race_time
-        if trial > distance:
-            wins += 1
-    return wins
+def solve_one_race(time: int, distance: int) -> int:
+    """How many whole hold times h win, h * (time - h) > distance
+
+    The winners lie strictly between the roots of h² - time·h + distance,
+    symmetric about time / 2. isqrt() puts the lower root within one of the
+    first winner, so this is exact for ints of any size."""
+
+    discriminant = time * time - 4 * distance
+    if discriminant < 0:
+        return 0
+    hold = (time - isqrt(discriminant)) // 2
+    while hold * (time - hold) <= distance:
+        hold += 1
+        if 2 * hold > time:
+            return 0
+    return time - 2 * hold + 1
+
+
+# time * time still fits in an int64 up to here
+MAX_INT64_TIME = isqrt(2**63 - 1)
+
+
+def solve_races(times, distances) -> "np.ndarray":
+    """solve_one_race() for arrays of times and distances at once
+
+    With float sqrt in place of isqrt the first winner can be a step or two
+    off, the loop settles every race together. Times too big for int64
+    arithmetic go through solve_one_race() one at a time instead."""
+
+    times = np.asarray(times)
+    distances = np.asarray(distances)
+    if times.dtype.kind != "i" or (times.size and times.max() > MAX_INT64_TIME):
+        return np.frompyfunc(solve_one_race, 2, 1)(times, distances)
+
+    discriminant = times * times - 4 * distances
+    root = np.sqrt(np.maximum(discriminant, 0)).astype(np.int64)
+    hold = np.maximum((times - root) // 2 - 2, 0)
+    while (losing := (hold * (times - hold) <= distances) & (2 * hold <= times)).any():
+        hold += losing
+    wins = hold * (times - hold) > distances
+    return np.where(wins & (discriminant >= 0), times - 2 * hold + 1, 0)
 
 
 def solve(input_data):
@@ -23,32 +57,57 @@ def solve(input_data):
     times = [int(t) for t in times.split()[1:]]
     distances = [int(t) for t in distances.split()[1:]]
 
-    score = 1
-    for time, distance in zip(times, distances):
-        score *= solve_one_race(time, distance)
-
-    return score
+    return prod(solve_races(times, distances).tolist())
 
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
+
+    # Test any examples given in the problem
 
-# Test any examples given in the problem
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample, 288),
+    ]
 
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample, 288),
-]
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
+    def brute_force(time, distance):
+        return sum(hold * (time - hold) > distance for hold in range(time + 1))
 
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    SMALL = [(t, d) for t in range(30) for d in range(-1, t * t // 4 + 2)]
+    # the float sqrt path right up to the int64 limit, and past it
+    NEAR_LIMIT = [
+        (t, t * t // 4 - k)
+        for t in range(MAX_INT64_TIME - 3, MAX_INT64_TIME + 1)
+        for k in (0, 1, 2, 10**6, 10**12)
+    ]
+    HUGE = [(10**40, 10**80 // 4 - 10**30), (10**40 + 1, 10**80 // 4)]
+
+    @pytest.mark.parametrize(
+        "races", [SMALL, NEAR_LIMIT, HUGE], ids=("small", "near int64 limit", "huge")
+    )
+    def test_solve_races(races) -> None:
+        times, distances = zip(*races)
+        expected = [solve_one_race(t, d) for t, d in races]
+        assert solve_races(np.array(times), np.array(distances)).tolist() == expected
+
+    def test_solve_one_race() -> None:
+        assert [solve_one_race(t, d) for t, d in SMALL] == [
+            brute_force(t, d) for t, d in SMALL
+        ]
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
@@ -1,30 +1,27 @@
 import sys
+from math import isqrt
 from pathlib import Path
 
-import pytest
-from icecream import ic
+from advent_2023.trace import ic
 
 
 # --> Puzzle solution
-def solve_one_race(time, distance):
-    # split time into hold_time, race_time
-    for i in range(time):
-        hold_time = i
-        race_time = time - i
-        trial = hold_time * race_time
-        if trial > distance:
-            left_fence = i
-            break
-
-    for i in range(time, 0, -1):
-        hold_time = i
-        race_time = time - i
-        trial = hold_time * race_time
-        if trial > distance:
-            right_fence = i
-            break
-
-    return right_fence - left_fence + 1
+def solve_one_race(time: int, distance: int) -> int:
+    """How many whole hold times h win, h * (time - h) > distance
+
+    The winners lie strictly between the roots of h² - time·h + distance,
+    symmetric about time / 2. isqrt() puts the lower root within one of the
+    first winner, so this is exact for ints of any size."""
+
+    discriminant = time * time - 4 * distance
+    if discriminant < 0:
+        return 0
+    hold = (time - isqrt(discriminant)) // 2
+    while hold * (time - hold) <= distance:
+        hold += 1
+        if 2 * hold > time:
+            return 0
+    return time - 2 * hold + 1
 
 
 def solve(input_data):
@@ -38,23 +35,27 @@ def solve(input_data):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample, 71503),
-]
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample, 71503),
+    ]
 
-
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
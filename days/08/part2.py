@@ -3,19 +3,19 @@ from itertools import cycle
 from math import gcd
 from pathlib import Path
 
-import parse as p
-import pytest
-from icecream import ic
+from advent_2023.parsing import LinePattern
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
+LINK = LinePattern("{} = ({}, {})")
+
 
 def parse(input_data):
     directions, links = input_data.split("\n\n")
     lefts = {}
     rights = {}
-    for link in links.splitlines():
-        start, left, right = p.parse("{} = ({}, {})", link)
+    for start, left, right in LINK.parse_all(links):
         lefts[start] = left
         rights[start] = right
 
@@ -51,23 +51,27 @@ def solve(input_data):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
-
-sample = Path("input-sample2.txt").read_text().strip()
-EXAMPLES = [
-    (sample, 6),
-]
+    # Test any examples given in the problem
 
+    sample = Path("input-sample2.txt").read_text().strip()
+    EXAMPLES = [
+        (sample, 6),
+    ]
 
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
@@ -3,8 +3,8 @@ from itertools import pairwise
 from pathlib import Path
 from typing import Self
 
-import pytest
-from icecream import ic
+from advent_2023.inputs import lines
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
@@ -45,27 +45,30 @@ class Sequence:
 
 
 def solve(input_data):
-    sequences = [Sequence.from_line(line) for line in input_data.splitlines()]
-    return sum(s.solve_p2() for s in sequences)
+    return sum(Sequence.from_line(line).solve_p2() for line in lines(input_data))
 
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [(sample, 2)]
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [(sample, 2)]
 
-
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
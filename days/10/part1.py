@@ -1,116 +1,67 @@
 import sys
 from pathlib import Path
-from typing import NamedTuple, Self
 
-import numpy as np
-import pytest
-from icecream import ic
+from advent_2023.grid import DIRECTIONS, EAST, NORTH, SOUTH, WEST, Grid, reverse
+from advent_2023.lazy import lazy_import
+from advent_2023.trace import ic
 
-# --> Puzzle solution
-
-
-class Point(NamedTuple):
-    row: int
-    col: int
-
-    def north(self) -> Self:
-        return Point(self.row - 1, self.col)
+np = lazy_import("numpy")
 
-    def south(self) -> Self:
-        return Point(self.row + 1, self.col)
-
-    def east(self) -> Self:
-        return Point(self.row, self.col + 1)
+# --> Puzzle solution
 
-    def west(self) -> Self:
-        return Point(self.row, self.col - 1)
+# The two directions each pipe opens to
+PIPES = {
+    "|": (NORTH, SOUTH),
+    "-": (WEST, EAST),
+    "L": (NORTH, EAST),
+    "J": (NORTH, WEST),
+    "7": (SOUTH, WEST),
+    "F": (SOUTH, EAST),
+}
 
-    def adjacent_points(self):
-        yield self.north()
-        yield self.east()
-        yield self.south()
-        yield self.west()
 
+class Map:
+    def __init__(self, input_data):
+        self.grid = Grid.from_text(input_data, fill=".")
+        ic(self.grid.view.view("S1"))
 
-def connector(ch: str, ch_loc: Point) -> tuple:  # noqa: PLR0911
-    match ch:
-        case "|":
-            return ch_loc.north(), ch_loc.south()
-        case "-":
-            return ch_loc.west(), ch_loc.east()
-        case "L":
-            return ch_loc.north(), ch_loc.east()
-        case "J":
-            return ch_loc.north(), ch_loc.west()
-        case "7":
-            return ch_loc.south(), ch_loc.west()
-        case "F":
-            return ch_loc.south(), ch_loc.east()
-        case _:
-            return ()
+        self.openings = [PIPES.get(chr(code), ()) for code in self.grid.cells.tolist()]
+        (s_location,) = np.flatnonzero(self.grid.cells == ord("S"))
+        self.s_location = int(s_location)
 
+    def get_starting_move(self, S) -> int:
+        """Used to find a direction out of S that a pipe connects to"""
 
-class Map:
-    def __init__(self, input_data):
-        s_location = None
-
-        lines = input_data.splitlines()
-        self.n_rows = len(lines)
-        self.n_cols = len(lines[0])
-        sketch = np.array([list(line) for line in lines])
-        ic(sketch)
-
-        for row, line in enumerate(lines):
-            for col, ch in enumerate(line):
-                if ch == "S":
-                    s_location = Point(row, col)
-                    break
-
-        assert s_location is not None
-        self.s_location = s_location
-        self.sketch = sketch
-
-    def valid(self, point: Point) -> bool:
-        return (0 <= point.row < self.n_rows) and (0 <= point.col < self.n_cols)
-
-    def get_starting_move(self, S) -> Point:
-        """Used to find the two places that connect to given point"""
-
-        for cand in S.adjacent_points():
-            ic(cand)
-            if not self.valid(cand):
-                ic("not valid")
-                continue
-
-            connections = connector(self.sketch[cand.row, cand.col], cand)
-            if S in connections:
-                return cand
+        for direction in DIRECTIONS:
+            cand = S + self.grid.offsets[direction]
+            ic(self.grid.position(cand))
+            if reverse(direction) in self.openings[cand]:
+                return direction
         raise Exception("oops")
 
-    def solve(self):
-        pos = self.get_starting_move(self.s_location)
-        ic("starting move", pos)
+    def walk(self) -> list[int]:
+        """Every position on the loop, in order, starting at S"""
 
-        visited = {self.s_location, pos}
+        direction = self.get_starting_move(self.s_location)
+        ic("starting move", direction)
 
+        pos = self.s_location
+        visited = [pos]
         while True:
-            connections = connector(self.sketch[pos.row, pos.col], pos)
-            assert connections is not None
-            ic(pos, connections)
-
-            if connections[0] in visited and connections[1] in visited:
+            pos += self.grid.offsets[direction]
+            if pos == self.s_location:
                 break
+            visited.append(pos)
 
-            if connections[0] in visited:
-                pos = connections[1]
-            else:
-                pos = connections[0]
+            # leave by the opening we didn't come in through
+            came_from = reverse(direction)
+            first, second = self.openings[pos]
+            direction = second if first == came_from else first
+            ic(self.grid.position(pos), direction)
+        return visited
 
-            ic(pos)
-            assert self.valid(pos)
-            visited.add(pos)
-
-        return len(visited) // 2
+    def solve(self):
+        return len(self.walk()) // 2
 
 
 def solve(input_data):
@@ -120,27 +71,31 @@ def solve(input_data):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-sample = Path("input-sample.txt").read_text().strip()
-sample2 = Path("input-sample-2.txt").read_text().strip()
-EXAMPLES = [
-    (sample, 4),
-    (sample2, 8),
-]
+    sample = Path("input-sample.txt").read_text().strip()
+    sample2 = Path("input-sample-2.txt").read_text().strip()
+    EXAMPLES = [
+        (sample, 4),
+        (sample2, 8),
+    ]
 
-
-@pytest.mark.parametrize(
-    "sample_data,sample_solution", EXAMPLES, ids=("sample", "sample2")
-)
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize(
+        "sample_data,sample_solution", EXAMPLES, ids=("sample", "sample2")
+    )
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
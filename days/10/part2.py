@@ -1,111 +1,66 @@
 import sys
 from pathlib import Path
-from typing import NamedTuple, Self
 
-import numpy as np
-import pytest
-from icecream import ic
+from advent_2023.grid import DIRECTIONS, EAST, NORTH, SOUTH, WEST, Grid, reverse
+from advent_2023.lazy import lazy_import
+from advent_2023.trace import ic
 
-# --> Puzzle solution
-
-
-class Point(NamedTuple):
-    row: int
-    col: int
-
-    def north(self) -> Self:
-        return Point(self.row - 1, self.col)
-
-    def south(self) -> Self:
-        return Point(self.row + 1, self.col)
-
-    def east(self) -> Self:
-        return Point(self.row, self.col + 1)
-
-    def west(self) -> Self:
-        return Point(self.row, self.col - 1)
-
-    def adjacent_points(self):
-        yield self.north()
-        yield self.east()
-        yield self.south()
-        yield self.west()
+np = lazy_import("numpy")
 
+# --> Puzzle solution
 
-def connector(ch: str, ch_loc: Point) -> tuple:  # noqa: PLR0911
-    match ch:
-        case "|":
-            return ch_loc.north(), ch_loc.south()
-        case "-":
-            return ch_loc.west(), ch_loc.east()
-        case "L":
-            return ch_loc.north(), ch_loc.east()
-        case "J":
-            return ch_loc.north(), ch_loc.west()
-        case "7":
-            return ch_loc.south(), ch_loc.west()
-        case "F":
-            return ch_loc.south(), ch_loc.east()
-        case _:
-            return ()
+# The two directions each pipe opens to
+PIPES = {
+    "|": (NORTH, SOUTH),
+    "-": (WEST, EAST),
+    "L": (NORTH, EAST),
+    "J": (NORTH, WEST),
+    "7": (SOUTH, WEST),
+    "F": (SOUTH, EAST),
+}
 
 
 class Map:
     def __init__(self, input_data):
-        s_location = None
+        self.grid = Grid.from_text(input_data, fill=".")
+        ic(self.grid.view.view("S1"))
 
-        lines = input_data.splitlines()
-        self.n_rows = len(lines)
-        self.n_cols = len(lines[0])
-        sketch = np.array([list(line) for line in lines])
-        ic(sketch)
+        self.openings = [PIPES.get(chr(code), ()) for code in self.grid.cells.tolist()]
+        (s_location,) = np.flatnonzero(self.grid.cells == ord("S"))
+        self.s_location = int(s_location)
 
-        for row, line in enumerate(lines):
-            for col, ch in enumerate(line):
-                if ch == "S":
-                    s_location = Point(row, col)
-                    break
-
-        assert s_location is not None
-        self.s_location = s_location
-        self.sketch = sketch
-
-    def valid(self, point: Point) -> bool:
-        return (0 <= point.row < self.n_rows) and (0 <= point.col < self.n_cols)
-
-    def get_starting_move(self, S):
-        """Used to find the two places that connect to given point"""
+    def get_starting_move(self, S) -> int:
+        """Used to find the two directions out of S that pipes connect to"""
 
         ok = []
-        for cand in S.adjacent_points():
-            if not self.valid(cand):
-                continue
-
-            connections = connector(self.sketch[cand.row, cand.col], cand)
-            if S in connections:
-                ok.append(cand)
+        for direction in DIRECTIONS:
+            cand = S + self.grid.offsets[direction]
+            if reverse(direction) in self.openings[cand]:
+                ok.append(direction)
 
         assert len(ok) == 2
         return ok[0]
 
-    def solve_1(self):
-        pos = self.get_starting_move(self.s_location)
-        self.visited = [self.s_location, pos]
+    def walk(self) -> list[int]:
+        """Every position on the loop, in order, starting at S"""
 
+        direction = self.get_starting_move(self.s_location)
+        pos = self.s_location
+        visited = [pos]
         while True:
-            connections = connector(self.sketch[pos.row, pos.col], pos)
-            assert connections is not None
-
-            if connections[0] in self.visited and connections[1] in self.visited:
+            pos += self.grid.offsets[direction]
+            if pos == self.s_location:
                 break
+            visited.append(pos)
 
-            if connections[0] in self.visited:
-                pos = connections[1]
-            else:
-                pos = connections[0]
+            # leave by the opening we didn't come in through
+            came_from = reverse(direction)
+            first, second = self.openings[pos]
+            direction = second if first == came_from else first
+        return visited
 
-            assert self.valid(pos)
-            self.visited.append(pos)
+    def solve_1(self):
+        self.visited = self.walk()
         return len(self.visited) // 2
 
     def solve_2(self):
@@ -114,8 +69,7 @@ class Map:
         # Shoelace formula to give area enclosed
         # https://en.wikipedia.org/wiki/Shoelace_formula
 
-        xs = [p.row for p in self.visited]
-        ys = [p.col for p in self.visited]
+        xs, ys = map(list, zip(*(self.grid.position(p) for p in self.visited)))
         x_shift = xs[1:] + [xs[0]]
         y_shift = ys[1:] + [ys[0]]
 
@@ -139,27 +93,31 @@ def solve(input_data):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-sample3 = Path("input-sample-3.txt").read_text().strip()
-sample4 = Path("input-sample-4.txt").read_text().strip()
-EXAMPLES = [
-    (sample4, 8),
-    (sample3, 10),
-]
+    sample3 = Path("input-sample-3.txt").read_text().strip()
+    sample4 = Path("input-sample-4.txt").read_text().strip()
+    EXAMPLES = [
+        (sample4, 8),
+        (sample3, 10),
+    ]
 
-
-@pytest.mark.parametrize(
-    "sample_data,sample_solution", EXAMPLES, ids=("first", "second")
-)
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize(
+        "sample_data,sample_solution", EXAMPLES, ids=("first", "second")
+    )
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
@@ -2,9 +2,10 @@ import sys
 from itertools import combinations
 from pathlib import Path
 
-import numpy as np
-import pytest
-from icecream import ic
+from advent_2023.lazy import lazy_import
+from advent_2023.trace import ic
+
+np = lazy_import("numpy")
 
 # --> Puzzle solution
 
@@ -57,23 +58,27 @@ def solve(input_data):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
-
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample, 374),
-]
+    # Test any examples given in the problem
 
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample, 374),
+    ]
 
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
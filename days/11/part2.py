@@ -2,9 +2,10 @@ import sys
 from itertools import combinations
 from pathlib import Path
 
-import numpy as np
-import pytest
-from icecream import ic
+from advent_2023.lazy import lazy_import
+from advent_2023.trace import ic
+
+np = lazy_import("numpy")
 
 # --> Puzzle solution
 
@@ -55,32 +56,36 @@ def solve(input_data, expansion_factor):
 
 # --> Test driven development helpers
 
-
-# Test any examples given in the problem
-
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample, 2, 374),
-    (sample, 10, 1030),
-    (sample, 100, 8410),
-]
-IDS = [
-    "sample2",
-    "sample10",
-    "sample100",
-]
-
-
-@pytest.mark.parametrize(
-    "sample_data,expansion_factor,sample_solution", EXAMPLES, ids=IDS
-)
-def test_samples(sample_data, expansion_factor, sample_solution) -> None:
-    assert solve(sample_data, expansion_factor) == sample_solution
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
+
+    # Test any examples given in the problem
+
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample, 2, 374),
+        (sample, 10, 1030),
+        (sample, 100, 8410),
+    ]
+    IDS = [
+        "sample2",
+        "sample10",
+        "sample100",
+    ]
+
+    @pytest.mark.parametrize(
+        "sample_data,expansion_factor,sample_solution", EXAMPLES, ids=IDS
+    )
+    def test_samples(sample_data, expansion_factor, sample_solution) -> None:
+        assert solve(sample_data, expansion_factor) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
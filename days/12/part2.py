@@ -1,5 +1,7 @@
 from pathlib import Path
 
+from advent_2023.inputs import lines
+
 # --> Puzzle solution
 
 
@@ -105,7 +107,7 @@ class StateMachine:
 def solve(input_data):
     solution = 0
 
-    for line in input_data.splitlines():
+    for line in lines(input_data):
         solution += StateMachine.from_line(line)
 
     return solution
@@ -1,9 +1,10 @@
 import sys
 from pathlib import Path
 
-import numpy as np
-import pytest
-from icecream import ic
+from advent_2023.lazy import lazy_import
+from advent_2023.trace import ic
+
+np = lazy_import("numpy")
 
 # --> Puzzle solution
 
@@ -113,40 +114,43 @@ def cycle(raw_data):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
-
-cycle_examples = Path("sample-cycles.txt").read_text().strip().split("\n\n")
-CYCLE_TESTS = [
-    (1, cycle_examples[0]),
-    (2, cycle_examples[1]),
-    (3, cycle_examples[2]),
-]
+    # Test any examples given in the problem
 
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample, 64),
-]
+    cycle_examples = Path("sample-cycles.txt").read_text().strip().split("\n\n")
+    CYCLE_TESTS = [
+        (1, cycle_examples[0]),
+        (2, cycle_examples[1]),
+        (3, cycle_examples[2]),
+    ]
 
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample, 64),
+    ]
 
-@pytest.mark.parametrize("n_cycles,result", CYCLE_TESTS, ids=(1, 2, 3))
-@pytest.mark.parametrize("sample", [sample], ids=("sample",))
-def test_cycle(sample, n_cycles, result):
-    raw_data = parse(sample)
-    expected_result = parse(result)
-    for _ in range(n_cycles):
-        raw_data = cycle(raw_data)
-    assert np.all(raw_data == expected_result)
+    @pytest.mark.parametrize("n_cycles,result", CYCLE_TESTS, ids=(1, 2, 3))
+    @pytest.mark.parametrize("sample", [sample], ids=("sample",))
+    def test_cycle(sample, n_cycles, result):
+        raw_data = parse(sample)
+        expected_result = parse(result)
+        for _ in range(n_cycles):
+            raw_data = cycle(raw_data)
+        assert np.all(raw_data == expected_result)
 
-
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.disable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
@@ -1,8 +1,8 @@
 import sys
 from pathlib import Path
 
-import pytest
-from icecream import ic
+from advent_2023.inputs import fields
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
@@ -18,38 +18,39 @@ def HASH(chain):
 
 def solve(input_data):
     result = 0
-    for item in input_data.split(","):
+    for item in fields(input_data):
         result += HASH(item)
     return result
 
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
+    EXAMPLES = [("HASH", 52)]
 
-EXAMPLES = [("HASH", 52)]
+    @pytest.mark.parametrize("chain,result", EXAMPLES)
+    def test_HASH(chain, result):
+        assert HASH(chain) == result
 
+    my_input = Path("input-sample.txt").read_text().strip()
 
-@pytest.mark.parametrize("chain,result", EXAMPLES)
-def test_HASH(chain, result):
-    assert HASH(chain) == result
-
-
-my_input = Path("input-sample.txt").read_text().strip()
-
-
-@pytest.mark.parametrize(
-    "sample_data,sample_solution", [(my_input, 1320)], ids=("sample",)
-)
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize(
+        "sample_data,sample_solution", [(my_input, 1320)], ids=("sample",)
+    )
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
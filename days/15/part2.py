@@ -3,8 +3,8 @@ from collections import defaultdict
 from pathlib import Path
 from typing import NamedTuple
 
-import pytest
-from icecream import ic
+from advent_2023.inputs import fields
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
@@ -51,7 +51,7 @@ def sequence(item, boxes):
 
 def solve(input_data):
     boxes = defaultdict(list)
-    for item in input_data.split(","):
+    for item in fields(input_data):
         sequence(item, boxes)
     ic(boxes)
     result = 0
@@ -63,31 +63,32 @@ def solve(input_data):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
+    EXAMPLES = [("HASH", 52)]
 
-EXAMPLES = [("HASH", 52)]
+    @pytest.mark.parametrize("chain,result", EXAMPLES)
+    def test_HASH(chain, result):
+        assert HASH(chain) == result
 
+    my_input = Path("input-sample.txt").read_text().strip()
 
-@pytest.mark.parametrize("chain,result", EXAMPLES)
-def test_HASH(chain, result):
-    assert HASH(chain) == result
-
-
-my_input = Path("input-sample.txt").read_text().strip()
-
-
-@pytest.mark.parametrize(
-    "sample_data,sample_solution", [(my_input, 145)], ids=("sample",)
-)
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize(
+        "sample_data,sample_solution", [(my_input, 145)], ids=("sample",)
+    )
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
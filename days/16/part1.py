@@ -1,130 +1,86 @@
 import sys
 from pathlib import Path
-from typing import NamedTuple, Self
 
-import numpy as np
-import pytest
-from icecream import ic
+from advent_2023.grid import EAST, NORTH, SOUTH, WEST, Grid
+from advent_2023.lazy import lazy_import
+from advent_2023.trace import ic
 
-# --> Puzzle solution
-
-
-class Point(NamedTuple):
-    row: int
-    col: int
+np = lazy_import("numpy")
 
-    def north(self) -> Self:
-        return Point(self.row - 1, self.col)
-
-    def south(self) -> Self:
-        return Point(self.row + 1, self.col)
-
-    def east(self) -> Self:
-        return Point(self.row, self.col + 1)
+# --> Puzzle solution
 
-    def west(self) -> Self:
-        return Point(self.row, self.col - 1)
+# Which way(s) a beam goes after entering a tile, indexed by the direction it
+# was travelling
+BEAMS = {
+    ".": ((NORTH,), (EAST,), (SOUTH,), (WEST,)),
+    "/": ((EAST,), (NORTH,), (WEST,), (SOUTH,)),
+    "\\": ((WEST,), (SOUTH,), (EAST,), (NORTH,)),
+    "|": ((NORTH,), (NORTH, SOUTH), (SOUTH,), (NORTH, SOUTH)),
+    "-": ((EAST, WEST), (EAST,), (EAST, WEST), (WEST,)),
+}
 
 
 class MirrorPuzzle:
-    def __init__(self, mirrors):
-        self.mirrors = mirrors
-        self.energized = np.zeros_like(mirrors, dtype=bool)
-        self.visited = set()
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        # BEAMS entry for every cell, None on the border around the map
+        self.tiles = [BEAMS.get(chr(code)) for code in grid.cells.tolist()]
+        # one flag per (position, direction) the beam has passed through
+        self.visited = bytearray(4 * len(self.tiles))
         self.workq = []
 
-    def check_in_bounds(self, row, col):
-        n_row, n_col = self.mirrors.shape
-        return (0 <= row < n_row) and (0 <= col < n_col)
-
     def solve(self):
-        self.workq.append((Point(0, -1), "east"))
+        self.workq.append((self.grid.index(0, -1), EAST))
 
         while len(self.workq):
             self.take_step(*self.workq.pop())
 
-        return np.sum(self.energized)
+        return self.energized()
+
+    def energized(self) -> int:
+        directions = np.frombuffer(self.visited, dtype=np.uint8).reshape(-1, 4)
+        return int(np.count_nonzero(directions.any(axis=1)))
 
     def take_step(self, pos, direction_of_travel):
-        get_step = getattr(pos, direction_of_travel)
-        new_pos = get_step()
-        if not self.check_in_bounds(*new_pos):
+        new_pos = pos + self.grid.offsets[direction_of_travel]
+        beams = self.tiles[new_pos]
+        if beams is None:
             return
 
-        if (new_pos, direction_of_travel) in self.visited:
+        seen = 4 * new_pos + direction_of_travel
+        if self.visited[seen]:
             return
+        self.visited[seen] = 1
 
-        self.energized[*new_pos] = True
-        self.visited.add((new_pos, direction_of_travel))
-
-        match (direction_of_travel, self.mirrors[new_pos]):
-            case "north", "\\":
-                self.workq.append((new_pos, "west"))
-
-            case "south", "\\":
-                self.workq.append((new_pos, "east"))
-
-            case "east", "\\":
-                self.workq.append((new_pos, "south"))
-
-            case "west", "\\":
-                self.workq.append((new_pos, "north"))
-
-            case "north", "/":
-                self.workq.append((new_pos, "east"))
-
-            case "south", "/":
-                self.workq.append((new_pos, "west"))
-
-            case "east", "/":
-                self.workq.append((new_pos, "north"))
-
-            case "west", "/":
-                self.workq.append((new_pos, "south"))
-
-            case ("north", "|") | ("south", "|"):
-                self.workq.append((new_pos, direction_of_travel))
-
-            case ("east", "|") | ("west", "|"):
-                self.workq.append((new_pos, "north"))
-                self.workq.append((new_pos, "south"))
-
-            case ("north", "-") | ("south", "-"):
-                self.workq.append((new_pos, "east"))
-                self.workq.append((new_pos, "west"))
-
-            case ("east", "-") | ("west", "-"):
-                self.workq.append((new_pos, direction_of_travel))
-
-            case _, ".":
-                self.workq.append((new_pos, direction_of_travel))
-
-            case _:
-                raise Exception("oops!")
+        for direction in beams[direction_of_travel]:
+            self.workq.append((new_pos, direction))
 
 
 def solve(my_input):
-    mirrors = np.array([list(row) for row in my_input.splitlines()])
-    return MirrorPuzzle(mirrors).solve()
+    return MirrorPuzzle(Grid.from_text(my_input)).solve()
 
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
-
-sample = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [(sample, 46)]
+    # Test any examples given in the problem
 
+    sample = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [(sample, 46)]
 
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
@@ -1,184 +1,87 @@
 import heapq
 import sys
 from pathlib import Path
-from typing import NamedTuple, Self
 
-import numpy as np
-import pytest
-from icecream import ic
+from advent_2023.grid import DIRECTIONS, EAST, SOUTH, Grid, reverse
+from advent_2023.lazy import lazy_import
+from advent_2023.trace import ic
 
-# --> Puzzle solution
-
-DIRECTIONS = ["south", "east", "north", "west"]
-REVERSE_DIRECTIONS = {
-    "south": "north",
-    "north": "south",
-    "east": "west",
-    "west": "east",
-}
-
-
-class Point(NamedTuple):
-    row: int
-    col: int
-
-    def north(self) -> Self:
-        return Point(self.row - 1, self.col)
-
-    def south(self) -> Self:
-        return Point(self.row + 1, self.col)
-
-    def east(self) -> Self:
-        return Point(self.row, self.col + 1)
-
-    def west(self) -> Self:
-        return Point(self.row, self.col - 1)
-
-    def go(self, direction) -> Self:
-        take_step = getattr(self, direction)
-        return take_step()
-
-
-class RecentPath:
-    def __init__(self, *args):
-        if len(args):
-            arg = args[0]
-            assert isinstance(arg, RecentPath)
-            self.direction = arg.direction
-            self.count = arg.count
-        else:
-            self.direction = None
-            self.count = 0
+np = lazy_import("numpy")
 
-    def update(self, direction):
-        if self.direction == direction:
-            self.count += 1
-        else:
-            self.direction = direction
-            self.count = 1
+# --> Puzzle solution
 
-    def must_turn(self):
-        assert 1 <= self.count <= 3
-        return self.count == 3
+# how far the crucible can go in a straight line
+MAX_STRAIGHT = 3
 
 
 class Map:
     def __init__(self, data):
         ic(data)
-        self.data = data
-        # assume worst case scenario is visiting every square
-        self.score_to_beat = np.sum(data)
-        self.n_row, self.n_col = data.shape
-        self.goal = Point(self.n_row - 1, self.n_col - 1)
+        # heat loss is 1-9, so a border of 0 marks off the edge of the map
+        self.grid = Grid(data, fill=0)
+        self.heat = self.grid.cells.tolist()
+        self.offsets = self.grid.offsets
+        self.start = self.grid.index(0, 0)
+        self.goal = self.grid.index(self.grid.n_rows - 1, self.grid.n_cols - 1)
         self.visisted = set()
 
-    def __getitem__(self, pos: Point):
-        return self.data[pos]
-
-    def in_bounds(self, point: Point):
-        return (0 <= point.row < self.n_row) and (0 <= point.col < self.n_col)
-
-    def move_options(self, path: "WorkPath"):
-        """Return all possible legal moves for given path"""
+    def move_options(self, pos: int, direction: int, count: int):
+        """Return all possible legal (direction, count) moves for given path"""
 
-        pos = path.current_pos
-        history = path.recent_path
-
-        for direction in DIRECTIONS:
+        for new_direction in DIRECTIONS:
             # check for reverse direction
-            if direction == REVERSE_DIRECTIONS[history.direction]:
+            if new_direction == reverse(direction):
                 continue
 
             # check for can't go the same way 4 times
-            if (direction == history.direction) and history.must_turn():
-                continue
+            if new_direction == direction:
+                if count == MAX_STRAIGHT:
+                    continue
+                new_count = count + 1
+            else:
+                new_count = 1
 
             # check for going off the edge
-            proposed = pos.go(direction)
-            if not self.in_bounds(proposed):
+            if not self.heat[pos + self.offsets[new_direction]]:
                 continue
 
-            yield direction
+            yield new_direction, new_count
 
-    def visitable(self, pos: Point, direction: str, count: int) -> bool:
-        cache_key = (*pos, direction, count)
+    def visitable(self, pos: int, direction: int, count: int) -> bool:
+        cache_key = (pos, direction, count)
         if cache_key in self.visisted:
             return False
         self.visisted.add(cache_key)
         return True
 
 
-class WorkPath:
-    def __init__(self, *args):
-        """Need to specify either a Map for new path to follow,
-        or an existing WorkPath to clone"""
-
-        if len(args) != 1:
-            raise ValueError(str(args))
-        arg = args[0]
-
-        if isinstance(arg, Map):
-            self.map = arg
-            self.recent_path = RecentPath()
-            self.current_pos = Point(0, 0)
-            self.score = 0
-            self.abort = False
-        elif isinstance(arg, WorkPath):
-            self.map = arg.map
-            self.recent_path = RecentPath(arg.recent_path)
-            self.current_pos = arg.current_pos
-            self.score = arg.score
-            self.abort = False
-        else:
-            raise ValueError(f"{type(arg)}")
-
-    @property
-    def sortable(self):
-        return (self.score, sum(self.current_pos))
-
-    def __lt__(self, other):
-        return self.sortable < other.sortable
-
-    def find_steps(self):
-        yield from self.map.move_options(self)
-
-    def take_step(self, direction):
-        self.current_pos = self.current_pos.go(direction)
-        self.score += self.map[self.current_pos]
-        self.recent_path.update(direction)
-        self.abort = not self.map.visitable(
-            self.current_pos, direction, self.recent_path.count
-        )
-
-    @property
-    def done(self):
-        return self.current_pos == self.map.goal
-
-
 class ScoreKeeper:
     def __init__(self, map):
         self.map = map
+        # (score, position, direction, steps taken in that direction)
         self.workq = []
 
-        # Create first two jobs by hand to fill in their "history" field
-        first_job = WorkPath(map)
-        first_job.take_step("east")
-        second_job = WorkPath(map)
-        second_job.take_step("south")
-
-        heapq.heappush(self.workq, (first_job.sortable, first_job))
-        heapq.heappush(self.workq, (second_job.sortable, second_job))
+        # Take the first two steps by hand to give them a direction
+        for direction in (EAST, SOUTH):
+            pos = map.start + map.offsets[direction]
+            map.visitable(pos, direction, 1)
+            heapq.heappush(self.workq, (map.heat[pos], pos, direction, 1))
 
     def solve(self):
+        heat, offsets, goal = self.map.heat, self.map.offsets, self.map.goal
         while len(self.workq):
-            _, item = heapq.heappop(self.workq)
-            for direction in item.find_steps():
-                clone = WorkPath(item)
-                clone.take_step(direction)
-                if clone.done:
-                    return clone.score
-                if not clone.abort:
-                    heapq.heappush(self.workq, (clone.sortable, clone))
+            score, pos, direction, count = heapq.heappop(self.workq)
+            for new_direction, new_count in self.map.move_options(
+                pos, direction, count
+            ):
+                new_pos = pos + offsets[new_direction]
+                new_score = score + heat[new_pos]
+                if new_pos == goal:
+                    return new_score
+                if self.map.visitable(new_pos, new_direction, new_count):
+                    heapq.heappush(
+                        self.workq, (new_score, new_pos, new_direction, new_count)
+                    )
         raise Exception("oops!")
 
 
@@ -194,23 +97,27 @@ def solve(input_data):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-sample_input = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample_input, 102),
-]
+    sample_input = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample_input, 102),
+    ]
 
-
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main(
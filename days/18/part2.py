@@ -1,39 +1,34 @@
 from pathlib import Path
 
-import numpy as np
-import parse as p
-from icecream import ic
+from advent_2023.inputs import lines
+from advent_2023.parsing import LinePattern
+from advent_2023.trace import ic
 
-
-def shoelace(coords):
-    xs = np.array([c[0] for c in coords])
-    ys = np.array([c[1] for c in coords])
-    return np.abs(np.dot(xs, np.roll(ys, 1)) - np.dot(np.roll(xs, 1), ys)) / 2
+DIG = LinePattern("{} {} (#{})")
 
 
 def picks(area, perimeter):
     return area + 1 + perimeter / 2
 
 
-def get_area(perimeter_coords, perimeter_length):
-    ic(perimeter_coords)
+def get_area(twice_area, perimeter_length):
+    ic(twice_area)
     ic(perimeter_length)
 
-    area = shoelace(perimeter_coords)
+    # Shoelace formula, summed up one corner at a time as the input is read
+    area = abs(twice_area) / 2
     ic(area)
     return picks(area, perimeter_length)
 
 
 def solve(input_data: str):
-    dig_coords: list[tuple[int, int]] = []
     cur_row = 0
     cur_col = 0
     perimeter = 0
+    twice_area = 0
 
-    data_rows = input_data.splitlines()
-
-    for data in data_rows:
-        _, _, code = p.parse("{} {} (#{})", data)
+    for data in lines(input_data):
+        _, _, code = DIG.parse(data)
         amt = int(code[:5], 16)
         perimeter += amt
 
@@ -46,17 +41,19 @@ def solve(input_data: str):
 
         match direction:
             case "R":
-                dig_coords.append((cur_row, cur_col + amt))
+                new_row, new_col = cur_row, cur_col + amt
             case "L":
-                dig_coords.append((cur_row, cur_col - amt))
+                new_row, new_col = cur_row, cur_col - amt
             case "D":
-                dig_coords.append((cur_row + amt, cur_col))
+                new_row, new_col = cur_row + amt, cur_col
             case "U":
-                dig_coords.append((cur_row - amt, cur_col))
+                new_row, new_col = cur_row - amt, cur_col
 
-        cur_row, cur_col = dig_coords[-1]
+        # the trench ends back at (0, 0), which closes the shoelace
+        twice_area += new_row * cur_col - cur_row * new_col
+        cur_row, cur_col = new_row, new_col
 
-    return get_area(dig_coords, perimeter)
+    return get_area(twice_area, perimeter)
 
 
 if __name__ == "__main__":
@@ -2,12 +2,13 @@ import sys
 from functools import partial
 from pathlib import Path
 
-import parse as p
-import pytest
-from icecream import ic
+from advent_2023.parsing import LinePattern
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
+RATING = LinePattern("{}={:d}")
+
 
 class Rule:
     def __init__(self, text):
@@ -71,7 +72,7 @@ def parse_parts(parts):
         part = {}
         items = line[1:-1].split(",")
         for item in items:
-            let, val = p.parse("{}={:d}", item)
+            let, val = RATING.parse(item)
             part[let] = val
         ic(part)
         result.append(part)
@@ -101,23 +102,27 @@ def solve(input_data):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
-
-sample_input = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample_input, 19114),
-]
+    # Test any examples given in the problem
 
+    sample_input = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample_input, 19114),
+    ]
 
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
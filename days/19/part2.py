@@ -3,8 +3,7 @@ from collections import defaultdict
 from functools import partial
 from pathlib import Path
 
-import pytest
-from icecream import ic
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
@@ -171,23 +170,27 @@ def solve(input_data):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-sample_input = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample_input, 167409079868000),
-]
+    sample_input = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample_input, 167409079868000),
+    ]
 
-
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
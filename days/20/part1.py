@@ -3,8 +3,7 @@ from collections import deque
 from pathlib import Path
 from typing import Any, NamedTuple
 
-import pytest
-from icecream import ic
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
@@ -144,32 +143,36 @@ def solve(input_data, rx_flag=False):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-sample_input = Path("input-sample.txt").read_text().strip()
-sample_input2 = Path("input-sample-2.txt").read_text().strip()
-EXAMPLES = [
-    (sample_input, 32000000),
-    (sample_input2, 11687500),
-]
+    sample_input = Path("input-sample.txt").read_text().strip()
+    sample_input2 = Path("input-sample-2.txt").read_text().strip()
+    EXAMPLES = [
+        (sample_input, 32000000),
+        (sample_input2, 11687500),
+    ]
 
-
-@pytest.mark.parametrize(
-    "sample_data,sample_solution",
-    EXAMPLES,
-    ids=(
-        "ex1",
-        "ex2",
-    ),
-)
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize(
+        "sample_data,sample_solution",
+        EXAMPLES,
+        ids=(
+            "ex1",
+            "ex2",
+        ),
+    )
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
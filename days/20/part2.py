@@ -4,7 +4,7 @@ from math import lcm
 from pathlib import Path
 from typing import Any, NamedTuple
 
-from icecream import ic
+from advent_2023.trace import ic
 
 # --> Puzzle solution
 
@@ -1,9 +1,10 @@
 import sys
 from pathlib import Path
 
-import numpy as np
-import pytest
-from icecream import ic
+from advent_2023.lazy import lazy_import
+from advent_2023.trace import ic
+
+np = lazy_import("numpy")
 
 # --> Puzzle solution
 
@@ -65,25 +66,29 @@ def solve(input_data, n_steps):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
-
-sample_input = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample_input, 6, 16),
-]
+    # Test any examples given in the problem
 
+    sample_input = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample_input, 6, 16),
+    ]
 
-@pytest.mark.parametrize(
-    "sample_data,n_steps,sample_solution", EXAMPLES, ids=("sample",)
-)
-def test_samples(sample_data, n_steps, sample_solution) -> None:
-    assert solve(sample_data, n_steps) == sample_solution
+    @pytest.mark.parametrize(
+        "sample_data,n_steps,sample_solution", EXAMPLES, ids=("sample",)
+    )
+    def test_samples(sample_data, n_steps, sample_solution) -> None:
+        assert solve(sample_data, n_steps) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
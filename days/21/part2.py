@@ -2,9 +2,10 @@ import sys
 from functools import cache
 from pathlib import Path
 
-import numpy as np
-import pytest
-from icecream import ic
+from advent_2023.lazy import lazy_import
+from advent_2023.trace import ic
+
+np = lazy_import("numpy")
 
 # --> Puzzle solution
 
@@ -59,27 +60,31 @@ def solve(input_data, n_steps):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
-
-sample_input = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample_input, 6, 16),
-    (sample_input, 10, 50),
-    (sample_input, 50, 1594),
-    (sample_input, 100, 6536),
-    (sample_input, 500, 167004),
-]
+    # Test any examples given in the problem
 
+    sample_input = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample_input, 6, 16),
+        (sample_input, 10, 50),
+        (sample_input, 50, 1594),
+        (sample_input, 100, 6536),
+        (sample_input, 500, 167004),
+    ]
 
-@pytest.mark.parametrize("sample_data,n_steps,sample_solution", EXAMPLES)
-def test_samples(sample_data, n_steps, sample_solution) -> None:
-    assert solve(sample_data, n_steps) == sample_solution
+    @pytest.mark.parametrize("sample_data,n_steps,sample_solution", EXAMPLES)
+    def test_samples(sample_data, n_steps, sample_solution) -> None:
+        assert solve(sample_data, n_steps) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
@@ -89,6 +94,7 @@ if __name__ == "__main__":
     else:
         print("tests PASSED")
 
+    sample_input = Path("input-sample.txt").read_text().strip()
     ic(solve(sample_input, 1))
     ic(solve(sample_input, 2))
     ic(solve(sample_input, 3))
@@ -2,11 +2,11 @@ from itertools import product
 from pathlib import Path
 from typing import NamedTuple
 
-import matplotlib.pyplot as plt
-import numpy as np
-import parse as p
-from icecream import ic
-from tqdm import tqdm
+from advent_2023.lazy import lazy_import
+from advent_2023.parsing import int_rows
+from advent_2023.trace import ic
+
+np = lazy_import("numpy")
 
 
 class Occupied(Exception):
@@ -33,11 +33,6 @@ class Brick:
         self.end2 = XYZ(x1, y1, z1)
         self.freeze = False
 
-    @classmethod
-    def from_line(cls, line: str):
-        args = p.parse("{:d},{:d},{:d}~{:d},{:d},{:d}", line)
-        return cls(*args)
-
     def __repr__(self):
         return f"Brick({self.end1},{self.end2})"
 
@@ -85,6 +80,9 @@ class Brick:
 
 
 def brick_viewer(bricks: list[Brick]):
+    # debugging aid only, keep matplotlib out of a normal import
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+
     fig = plt.figure()
     ax = fig.add_subplot(projection="3d")
     dims = [max(brick.max(dim) for brick in bricks) + 1 for dim in list("xyz")]
@@ -105,7 +103,7 @@ def brick_viewer(bricks: list[Brick]):
 
 
 def load_bricks(input_data: str) -> list[Brick]:
-    return [Brick.from_line(line) for line in input_data.splitlines()]
+    return [Brick(*ends) for ends in int_rows(input_data, 6).tolist()]
 
 
 def land_bricks(bricks: list[Brick]) -> list[Brick]:
@@ -142,6 +140,8 @@ def land_bricks(bricks: list[Brick]) -> list[Brick]:
 
 
 def part_1(bricks: list[Brick]) -> list[Brick]:
+    from tqdm import tqdm  # noqa: PLC0415
+
     for brick in bricks:
         brick.freeze = True
     # start by assuming all bricks are stable
@@ -158,9 +158,13 @@ def part_1(bricks: list[Brick]) -> list[Brick]:
     return score
 
 
+def solve(input_data):
+    bricks = load_bricks(input_data)
+    bricks = land_bricks(bricks)
+    return part_1(bricks)
+
+
 if __name__ == "__main__":
     my_input = Path("input.txt").read_text().strip()
-    bricks = load_bricks(my_input)
-    bricks = land_bricks(bricks)
-    score = part_1(bricks)
+    score = solve(my_input)
     print(score)
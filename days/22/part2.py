@@ -3,8 +3,10 @@ from itertools import product
 from pathlib import Path
 from typing import NamedTuple
 
-import numpy as np
-import parse as p
+from advent_2023.lazy import lazy_import
+from advent_2023.parsing import int_rows
+
+np = lazy_import("numpy")
 
 
 class Occupied(Exception):
@@ -32,11 +34,6 @@ class Brick:
         self.end2 = XYZ(x1, y1, z1)
         self.marked = False
 
-    @classmethod
-    def from_line(cls, line: str):
-        args = p.parse("{:d},{:d},{:d}~{:d},{:d},{:d}", line)
-        return cls(*args)
-
     def __repr__(self):
         return f"Brick({self.end1},{self.end2})"
 
@@ -82,7 +79,7 @@ class Brick:
 
 
 def load_bricks(input_data: str) -> list[Brick]:
-    return [Brick.from_line(line) for line in input_data.splitlines()]
+    return [Brick(*ends) for ends in int_rows(input_data, 6).tolist()]
 
 
 def land_bricks(bricks: list[Brick]) -> list[Brick]:
@@ -176,9 +173,13 @@ def part_2(bricks: list[Brick]) -> int:
     return score
 
 
+def solve(input_data):
+    bricks = load_bricks(input_data)
+    bricks = land_bricks(bricks)
+    return part_2(bricks)
+
+
 if __name__ == "__main__":
     my_input = Path("input.txt").read_text().strip()
-    bricks = load_bricks(my_input)
-    bricks = land_bricks(bricks)
-    score = part_2(bricks)
+    score = solve(my_input)
     print(score)
@@ -1,120 +1,87 @@
-import itertools
-from collections import defaultdict
+import sys
 from pathlib import Path
-from typing import NamedTuple
 
-import numpy as np
-import pytest
-from icecream import ic
+from advent_2023.grid import Grid
+from advent_2023.lazy import lazy_import
+from advent_2023.trace import ic
 
-# --> Puzzle solution
-
-DIRECTIONS = [
-    "north",
-    "south",
-    "east",
-    "west",
-]
-
-
-class Point(NamedTuple):
-    row: int
-    col: int
-
-    def north(self) -> "Point":
-        return Point(self.row - 1, self.col)
+np = lazy_import("numpy")
 
-    def south(self) -> "Point":
-        return Point(self.row + 1, self.col)
-
-    def east(self) -> "Point":
-        return Point(self.row, self.col + 1)
-
-    def west(self) -> "Point":
-        return Point(self.row, self.col - 1)
-
-    def go(self, direction):
-        return getattr(self, direction)()
+# --> Puzzle solution
 
 
 class HikingTrail:
     def __init__(self, my_input):
         lines = my_input.splitlines()
 
-        self.trails = np.array([[(cell != "#") for cell in list(row)] for row in lines])
-        self.n_row, self.n_col = self.trails.shape
-
-        self.start = Point(0, np.where(np.array(list(lines[0])) == ".")[0][0])
-        self.finish = Point(
-            self.n_row - 1, np.where(np.array(list(lines[-1])) == ".")[0][0]
-        )
-
-        nodes = {self.start, self.finish}
-        for row, col in itertools.product(range(self.n_row), range(self.n_col)):
-            if not self.trails[row, col]:
-                continue
-            pt = Point(row, col)
-            choices = self.get_choices(pt, set())
-            if len(choices) > 2:
-                nodes.add(pt)
-
-        ic(nodes)
+        grid = Grid.from_text(my_input, fill="#")
+        open_cells = grid.cells != ord("#")
+        self.trails = open_cells.tolist()
+        self.offsets = grid.offsets
+
+        self.start = grid.index(0, lines[0].index("."))
+        self.finish = grid.index(grid.n_rows - 1, lines[-1].index("."))
+
+        # the junctions, plus both ends, are the nodes of a much smaller graph
+        exits = open_cells[grid.neighbors].sum(axis=1)
+        junctions = np.flatnonzero(open_cells & (exits > 2)).tolist()
+        positions = [self.start, self.finish, *junctions]
+        self.nodes = {pos: node for node, pos in enumerate(positions)}
+        ic(positions)
+
+        # edges[node][other node] is the length of the trail between them
+        self.edges = [{} for _ in positions]
+        for node, pos in enumerate(positions):
+            for choice in self.get_choices(pos, pos):
+                end, cost = self.follow_trail(pos, choice)
+                if end is None or end == node:
+                    continue
+                self.edges[node][end] = max(cost, self.edges[node].get(end, 0))
+        ic(self.edges)
 
-        edges = []
-        # start pt, current pt, visit set
-        workq = [(n, n, {n}) for n in nodes]
-        while len(workq):
-            start_pt, current_pt, current_path = workq.pop()
-            choices = self.get_choices(current_pt, current_path)
-            for choice in choices:
-                if choice in nodes:
-                    edges.append((start_pt, choice, len(current_path)))
-                else:
-                    new_path = set(current_path)
-                    new_path.add(choice)
-                    workq.append((start_pt, choice, new_path))
-
-        self.map = defaultdict(dict)
-        for item in edges:
-            start, end, cost = item
-            self.map[start][end] = cost
-            self.map[end][start] = cost
-        ic(self.map)
-
-    def get_choices(self, pos, visit_set):
+    def get_choices(self, pos, came_from):
         result = []
 
-        for direction in DIRECTIONS:
-            new_pos = pos.go(direction)
-            if (
-                # Not off the grid
-                (0 <= new_pos[0] < self.n_row)
-                and (0 <= new_pos[1] < self.n_col)
-                # not already visited
-                and (new_pos not in visit_set)
-                # is an open space
-                and (self.trails[new_pos])
-            ):
+        for offset in self.offsets:
+            new_pos = pos + offset
+            # an open space we didn't just come from
+            if self.trails[new_pos] and new_pos != came_from:
                 result.append(new_pos)
         return result
 
+    def follow_trail(self, node_pos, pos):
+        """Walk from a node through pos until the next node
+
+        Returns that node and the number of steps, or None for the node if
+        the trail is a dead end."""
+
+        came_from, steps = node_pos, 1
+        while pos not in self.nodes:
+            choices = self.get_choices(pos, came_from)
+            if not choices:
+                return None, steps
+            came_from, pos = pos, choices[0]
+            steps += 1
+        return self.nodes[pos], steps
+
     def take_a_hike(self):
+        start, finish = self.nodes[self.start], self.nodes[self.finish]
         max_score = 0
-        workq = [(self.start, {self.start}, 0)]
+        # visit sets are bitmasks of node numbers
+        workq = [(start, 1 << start, 0)]
 
         while len(workq):
-            cur_pos, visit_set, cost = workq.pop()
-            for dest, step_cost in self.map[cur_pos].items():
-                if dest in visit_set:
+            cur_node, visit_set, cost = workq.pop()
+            for dest, step_cost in self.edges[cur_node].items():
+                dest_bit = 1 << dest
+                if visit_set & dest_bit:
                     continue
                 new_cost = cost + step_cost
-                if dest == self.finish:
+                if dest == finish:
                     if new_cost > max_score:
                         max_score = new_cost
                 else:
-                    dest_visit_set = set(visit_set)
-                    dest_visit_set.add(dest)
-                    workq.append((dest, dest_visit_set, new_cost))
+                    workq.append((dest, visit_set | dest_bit, new_cost))
         return max_score
 
 
@@ -124,23 +91,27 @@ def solve(input_data):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-sample_input = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample_input, 154),
-]
+    sample_input = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample_input, 154),
+    ]
 
-
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--pdb", "--capture=tee-sys", "-v"])
@@ -2,10 +2,11 @@ import sys
 from pathlib import Path
 from typing import NamedTuple
 
-import parse as p
-import pytest
-import sympy
-from icecream import ic
+from advent_2023.lazy import lazy_import
+from advent_2023.parsing import int_rows
+from advent_2023.trace import ic
+
+sympy = lazy_import("sympy")
 
 # --> Puzzle solution
 
@@ -18,10 +19,9 @@ class Hailstone(NamedTuple):
     vy: int
     vz: int
 
-    @classmethod
-    def from_line(cls, line):
-        args = p.parse("{:d}, {:d}, {:d} @ {:d}, {:d}, {:d}", line)
-        return cls(*args)
+
+def parse_hailstones(input_data):
+    return [Hailstone(*row) for row in int_rows(input_data, 6).tolist()]
 
 
 def line_up(
@@ -50,29 +50,33 @@ def line_up(
 
 
 def solve(input_data):
-    stones = [Hailstone.from_line(line) for line in input_data.splitlines()]
+    stones = parse_hailstones(input_data)
     return line_up(*stones[:3])
 
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
+    # Test any examples given in the problem
 
-sample_input = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample_input, 47),
-]
+    sample_input = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample_input, 47),
+    ]
 
-
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
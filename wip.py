@@ -1,10 +1,11 @@
 import sys
 from pathlib import Path
 
-import numpy as np
-import pandas as pd
-import pytest
-from icecream import ic
+from advent_2023.lazy import lazy_import
+from advent_2023.trace import ic
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
 
 # --> Puzzle solution
 
@@ -15,23 +16,27 @@ def solve(input_data):
 
 # --> Test driven development helpers
 
+# Only defined under pytest, so a plain import skips pytest and the samples
+if "pytest" in sys.modules:
+    import pytest
 
-# Test any examples given in the problem
-
-sample_input = Path("input-sample.txt").read_text().strip()
-EXAMPLES = [
-    (sample_input, 0),
-]
+    # Test any examples given in the problem
 
+    sample_input = Path("input-sample.txt").read_text().strip()
+    EXAMPLES = [
+        (sample_input, 0),
+    ]
 
-@pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
-def test_samples(sample_data, sample_solution) -> None:
-    assert solve(sample_data) == sample_solution
+    @pytest.mark.parametrize("sample_data,sample_solution", EXAMPLES, ids=("sample",))
+    def test_samples(sample_data, sample_solution) -> None:
+        assert solve(sample_data) == sample_solution
 
 
 # --> Setup and run
 
 if __name__ == "__main__":
+    import pytest
+
     #  Run the test examples with icecream debug-trace turned on
     ic.enable()
     ex = pytest.main([__file__, "--capture=tee-sys", "-v"])
@@ -41,8 +46,8 @@ if __name__ == "__main__":
     else:
         print("tests PASSED")
 
-    #  Actual input data generally has more iterations, turn off log
-    ic.disable()
-    my_input = Path("input.txt").read_text().strip()
-    result = solve(my_input)
-    print(result)
+    #  Actual input data goes through the runner so the timing skips pytest
+    #  and icecream setup, use `python -m advent_2023 run --repeat N` for more
+    from advent_2023.cli import main
+
+    sys.exit(main(["run", "--path", __file__]))